@@ -11,6 +11,11 @@ import requests
 from tavily import TavilyClient
 from dotenv import load_dotenv
 
+# ================================
+# Local / project imports
+# ================================
+from tool_replay import replayable_tool
+
 # ================================
 
 load_dotenv()
@@ -21,6 +26,7 @@ session.headers.update(
 )
 
 
+@replayable_tool("arxiv_search_tool")
 def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
     """
     Searches arXiv for research papers matching the given query.
@@ -94,6 +100,7 @@ arxiv_tool_def = {
 }
 
 
+@replayable_tool("tavily_search_tool")
 def tavily_search_tool(
     query: str, max_results: int = 5, include_images: bool = False
 ) -> list[dict]:
@@ -0,0 +1,104 @@
+"""
+Round-trip cost of a 20-step email tool sequence (like one LLM agent turn)
+with a new connection per call (module-level `requests.get/post/...`, the
+previous behaviour) versus the pooled keep-alive session in email_tools.
+
+Runs entirely against a local stub of the email API:
+
+    python bench_email_client.py [runs]
+"""
+
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+EMAIL = {
+    "id": 1, "sender": "boss@email.com", "recipient": "you@email.com",
+    "subject": "Quarterly Report", "body": "Please finalize the report ASAP.",
+    "timestamp": "2025-01-01T09:00:00", "read": False,
+}
+LIST_RESPONSE = json.dumps([dict(EMAIL, id=i) for i in range(1, 7)]).encode("utf-8")
+ONE_RESPONSE = json.dumps(EMAIL).encode("utf-8")
+
+
+class StubEmailHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # allow keep-alive
+    disable_nagle_algorithm = True  # avoid delayed-ACK stalls on reused connections
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        path = self.path.split("?")[0]
+        body = LIST_RESPONSE if path in ("/emails", "/emails/unread", "/emails/search", "/emails/filter") else ONE_RESPONSE
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_PATCH = do_POST = do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+def tool_sequence(email_tools) -> None:
+    """20 tool calls, as an agent triaging an inbox would issue them."""
+    email_tools.list_unread_emails()
+    email_tools.search_unread_from_sender("boss@email.com")
+    for email_id in range(1, 7):
+        email_tools.get_email(email_id)
+        email_tools.mark_email_as_read(email_id)
+    email_tools.search_emails("report")
+    email_tools.filter_emails(recipient="you@email.com")
+    email_tools.send_email("boss@email.com", "Re: Quarterly Report", "On it.")
+    email_tools.mark_email_as_unread(1)
+    email_tools.delete_email(6)
+    email_tools.list_all_emails()
+
+
+def _timed_runs(email_tools, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        tool_sequence(email_tools)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    print(f"{label:<28} mean {statistics.mean(timings):8.2f} ms   "
+          f"median {statistics.median(timings):8.2f} ms   per call {statistics.mean(timings) / 20:6.3f} ms")
+
+
+def main(runs: int = 50) -> None:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubEmailHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    os.environ["M3_EMAIL_SERVER_API_URL"] = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    import email_tools
+    email_tools.BASE_URL = os.environ["M3_EMAIL_SERVER_API_URL"]
+    pooled = email_tools.session
+
+    try:
+        tool_sequence(email_tools)  # warm-up
+        print(f"{runs} runs of a 20-call tool sequence against {email_tools.BASE_URL}")
+        email_tools.session = requests  # module-level functions: new connection per call
+        _report("new connection per call", _timed_runs(email_tools, runs))
+        email_tools.session = pooled
+        _report("pooled keep-alive session", _timed_runs(email_tools, runs))
+    finally:
+        email_tools.session = pooled
+        httpd.shutdown()
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,175 @@
+"""
+Load test for the email service: requests/sec and latency at increasing
+numbers of concurrent clients.
+
+Starts `uvicorn email_server.email_service:app` in a throwaway directory (so
+it gets its own emails.db), seeds a few hundred emails, then runs a mixed
+read/write workload (listing, filtering, reading single emails, marking
+read/unread, sending) from N concurrent asyncio clients for a fixed time.
+Each client is a bare keep-alive HTTP/1.1 connection on asyncio streams, so the
+load generator stays cheap next to the server (httpx's async pool becomes the
+bottleneck itself at these concurrency levels).
+
+    python bench_email_load.py [--concurrency 50 100 200] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SENDERS = ["boss@email.com", "alice@work.com", "bob@work.com", "charlie@work.com"]
+
+
+def _start_server(app_dir: str, port: int, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ, PYTHONPATH=app_dir)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "email_server.email_service:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=workdir, env=env,
+    )
+
+
+def _wait_until_up(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"email server at {base_url} did not start")
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection (enough for uvicorn's Content-Length responses)."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, params: dict = None, payload: dict = None) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        if params:
+            path += "?" + urlencode(params)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + body)
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def _one_request(conn: _Connection, rng: random.Random, ids: list[int]) -> int:
+    roll = rng.random()
+    if roll < 0.35:
+        return await conn.request("GET", "/emails", {"limit": 20})
+    if roll < 0.55:
+        return await conn.request("GET", "/emails/unread", {"limit": 20, "fields": "id,sender,subject"})
+    if roll < 0.70:
+        return await conn.request("GET", f"/emails/{rng.choice(ids)}")
+    if roll < 0.80:
+        return await conn.request("GET", "/emails/filter", {"sender": rng.choice(SENDERS), "read": "false"})
+    if roll < 0.95:
+        state = "read" if rng.random() < 0.5 else "unread"
+        return await conn.request("PATCH", f"/emails/{rng.choice(ids)}/{state}")
+    return await conn.request("POST", "/send", payload={
+        "recipient": rng.choice(SENDERS), "subject": "Load test", "body": "Sent by bench_email_load.py",
+    })
+
+
+async def _run_level(host: str, port: int, concurrency: int, duration: float, ids: list[int]) -> dict:
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(seed: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed)
+        conn = _Connection(host, port)
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    status = await _one_request(conn, rng, ids)
+                except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                    conn.close()
+                    conn = _Connection(host, port)
+                    status = 0
+                latencies.append(time.perf_counter() - start)
+                if status >= 400 or status == 0:
+                    errors += 1
+        finally:
+            conn.close()
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+        "p99": latencies[int(len(latencies) * 0.99)] * 1000,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--emails", type=int, default=500, help="emails to seed before the run")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--app-dir", default=HERE, help="lab directory containing email_server/")
+    args = parser.parse_args()
+
+    host = "127.0.0.1"
+    base_url = f"http://{host}:{args.port}"
+    with tempfile.TemporaryDirectory() as workdir:
+        server = _start_server(args.app_dir, args.port, workdir)
+        try:
+            _wait_until_up(base_url)
+            with httpx.Client(base_url=base_url) as client:
+                for i in range(args.emails):
+                    client.post("/send", json={"recipient": SENDERS[i % len(SENDERS)],
+                                               "subject": f"Seed {i}", "body": "Seed email"})
+                ids = [email["id"] for email in client.get("/emails", params={"fields": "id"}).json()]
+
+            print(f"{len(ids)} emails, {args.duration:.0f} s per level, server {base_url}")
+            print(f"{'clients':>8} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+            for concurrency in args.concurrency:
+                r = asyncio.run(_run_level(host, args.port, concurrency, args.duration, ids))
+                print(f"{concurrency:>8} {r['requests']:>9} {r['rps']:>8.0f} {r['p50']:>8.1f} "
+                      f"{r['p95']:>8.1f} {r['p99']:>8.1f} {r['errors']:>7}")
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
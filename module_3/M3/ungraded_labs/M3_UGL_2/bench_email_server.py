@@ -0,0 +1,164 @@
+"""
+Query latency of the email service against a large synthetic mailbox.
+
+Seeds a throwaway SQLite database (default 1,000,000 emails; reused between
+runs) with the same schema, indexes and FTS5 search index as the email
+service, then times:
+
+- /emails/search the old way (three ILIKE '%q%' scans) against the FTS5 index;
+- the list/filter/unread endpoint queries with and without the composite
+  indexes from email_models.py (dropped inside a transaction that is rolled
+  back, so the database is left unchanged).
+
+    python bench_email_server.py [rows] [db_path]
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
+
+from email_server import email_queries, email_search
+from email_server.email_models import Base, Email
+
+WORDS = (
+    "report quarterly budget meeting lunch review code deploy release invoice contract schedule "
+    "project deadline update team offsite travel expense approval design feedback customer support "
+    "ticket outage incident roadmap planning hiring interview candidate onboarding security audit "
+    "compliance training workshop conference slides demo prototype launch marketing campaign sales "
+    "forecast revenue pipeline partner vendor renewal license migration database backup server "
+    "network latency performance benchmark analytics dashboard metrics experiment survey results"
+).split()
+DOMAINS = ["work.com", "email.com", "mail.com", "partner.org", "vendor.io"]
+
+
+def _random_email(rng: random.Random, senders: list[str], start: datetime) -> tuple:
+    subject = " ".join(rng.choices(WORDS, k=rng.randint(2, 5))).capitalize()
+    body = " ".join(rng.choices(WORDS, k=rng.randint(15, 40))) + "."
+    timestamp = start + timedelta(seconds=rng.randint(0, 2 * 365 * 24 * 3600))
+    return (rng.choice(senders), rng.choice(senders[:50]), subject, body,
+            timestamp.strftime("%Y-%m-%d %H:%M:%S.%f"), rng.random() < 0.7)
+
+
+def seed_database(path: str, rows: int, seed: int = 42):
+    """Create (or reuse) a benchmark database with `rows` synthetic emails."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for index in Email.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        email_search.create_search_index(conn)
+
+    raw = engine.raw_connection()
+    try:
+        existing = raw.execute("SELECT COUNT(*) FROM emails").fetchone()[0]
+        if existing >= rows:
+            return engine
+        rng = random.Random(seed + existing)
+        senders = [f"user{i}@{rng.choice(DOMAINS)}" for i in range(2000)]
+        start = datetime(2024, 1, 1)
+        print(f"seeding {rows - existing:,} emails into {path} ...", flush=True)
+        began = time.perf_counter()
+        batch = 50_000
+        for offset in range(existing, rows, batch):
+            raw.executemany(
+                "INSERT INTO emails (sender, recipient, subject, body, timestamp, read) VALUES (?, ?, ?, ?, ?, ?)",
+                [_random_email(rng, senders, start) for _ in range(min(batch, rows - offset))],
+            )
+            raw.commit()
+        raw.execute("ANALYZE")
+        raw.execute("INSERT INTO emails_fts(emails_fts) VALUES ('optimize')")
+        raw.commit()
+        print(f"seeded in {time.perf_counter() - began:.1f} s", flush=True)
+    finally:
+        raw.close()
+    return engine
+
+
+def _time(label: str, func, repeat: int = 5) -> None:
+    func()  # warm the page cache
+    timings, count = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func())
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"  {label:<40} median {statistics.median(timings):9.2f} ms   ({count} rows)")
+
+
+def _ilike_search(db, q: str) -> list:
+    """The previous /emails/search implementation."""
+    return db.query(Email).filter(
+        (Email.subject.ilike(f"%{q}%")) |
+        (Email.body.ilike(f"%{q}%")) |
+        (Email.sender.ilike(f"%{q}%"))
+    ).order_by(Email.timestamp.desc()).all()
+
+
+def bench_search(db) -> None:
+    print("GET /emails/search")
+    sender = db.query(Email.sender).filter(Email.id == 1).scalar()
+    for q in [sender, "outage", "quarterly budget", "migr"]:
+        print(f" q={q!r}")
+        _time("ILIKE scan (all matches)", lambda: _ilike_search(db, q), repeat=1)
+        _time("FTS5 bm25 (limit=100)", lambda: db.scalars(email_search.search_query(q, 100)).all())
+
+
+def _first_rows(conn, sql: str, params: tuple, count: int = 100):
+    """First `count` rows of a query: what the first page of an endpoint costs."""
+    return lambda: conn.execute(sql, params).fetchmany(count)
+
+
+def bench_list_queries(db, path: str) -> None:
+    sample = db.query(Email).filter(Email.id == 1).one()
+    week = (datetime(2024, 6, 1), datetime(2024, 6, 8))
+    queries = {
+        "GET /emails": email_queries.list_query(),
+        "GET /emails/unread": email_queries.unread_query(),
+        "filter sender + unread": email_queries.filter_query(sender=sample.sender, read=False),
+        "filter recipient": email_queries.filter_query(recipient=sample.recipient),
+        "filter recipient + week": email_queries.filter_query(
+            recipient=sample.recipient, date_from=week[0], date_to=week[1]),
+        "filter week": email_queries.filter_query(date_from=week[0], date_to=week[1]),
+    }
+    dialect = db.get_bind().dialect
+    compiled = {label: email_queries.compile_query(query, dialect) for label, query in queries.items()}
+    index_names = [index.name for index in Email.__table__.indexes]
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        print("list / filter / unread endpoints (first 100 rows, newest first)")
+        for label, (sql, params) in compiled.items():
+            print(f" {label}")
+            _time("composite indexes", _first_rows(conn, sql, params))
+            conn.execute("BEGIN")
+            try:
+                for name in index_names:
+                    conn.execute(f"DROP INDEX {name}")
+                _time("id index only (before)", _first_rows(conn, sql, params), repeat=1)
+            finally:
+                conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+
+
+def main(rows: int = 1_000_000, path: str = "bench_emails.db") -> None:
+    engine = seed_database(path, rows)
+    db = sessionmaker(bind=engine)()
+    try:
+        print(f"{db.query(Email).count():,} emails in {path} ({os.path.getsize(path) / 2**20:.0f} MiB)")
+        bench_search(db)
+        bench_list_queries(db, path)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         sys.argv[2] if len(sys.argv) > 2 else "bench_emails.db")
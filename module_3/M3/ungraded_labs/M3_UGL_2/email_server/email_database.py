@@ -1,9 +1,43 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 DATABASE_URL = "sqlite:///./emails.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./emails.db"
 
+# Applied to every new SQLite connection
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",      # readers and the writer no longer block each other
+    "synchronous": "NORMAL",    # with WAL: fsync at checkpoints only, still crash-safe
+    "cache_size": -65536,       # 64 MiB page cache per connection (negative = KiB)
+    "mmap_size": 268435456,     # read up to 256 MiB of the file through mmap
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,       # wait up to 5 s for the write lock instead of failing
+}
+
+# Connections of the async engine. SQLite allows one writer at a time and every
+# aiosqlite connection runs in its own thread, so a few connections serve
+# hundreds of concurrent requests best; the rest wait on the pool, not on threads.
+POOL_SIZE = 5
+MAX_OVERFLOW = 5
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+
+# Sync engine, for scripts and notebooks
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+event.listen(engine, "connect", _apply_pragmas)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+# Async engine (aiosqlite), used by the API
+async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
+event.listen(async_engine.sync_engine, "connect", _apply_pragmas)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, func
 from datetime import datetime
 from .email_database import Base
 
@@ -13,3 +13,16 @@ class Email(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     read = Column(Boolean, default=False)  
 
+    # One index per access path of the list endpoints, all ending in timestamp
+    # so results come out newest-first without a sort (see email_queries.py)
+    __table_args__ = (
+        # /emails and /emails/filter?date_from=...&date_to=...
+        Index("ix_emails_timestamp", timestamp),
+        # /emails/unread and /emails/filter?read=...
+        Index("ix_emails_read_timestamp", read, timestamp),
+        # /emails/filter?recipient=... (optionally with a date range)
+        Index("ix_emails_recipient_timestamp", recipient, timestamp),
+        # /emails/filter?sender=...&read=... (case-insensitive sender)
+        Index("ix_emails_sender_read_timestamp", func.lower(sender), read, timestamp),
+    )
+
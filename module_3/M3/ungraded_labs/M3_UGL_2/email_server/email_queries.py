@@ -0,0 +1,195 @@
+from sqlalchemy import Connection, delete, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from .email_models import Email
+from datetime import datetime
+import base64
+import binascii
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+# Queries behind the list endpoints, as select() statements that run on both
+# sync and async sessions. Each one has a matching index in email_models.py;
+# check_query_plans() verifies that SQLite actually uses it.
+# They all order by (timestamp, id) descending, the keyset used for paging.
+
+def list_query():
+    """GET /emails: every email, newest first."""
+    return select(Email).order_by(Email.timestamp.desc(), Email.id.desc())
+
+
+def unread_query():
+    """GET /emails/unread: unread emails, newest first."""
+    return select(Email).where(Email.read == False).order_by(Email.timestamp.desc(), Email.id.desc())
+
+
+def filter_conditions(sender: str | None = None, read: bool | None = None, recipient: str | None = None,
+                      date_from: datetime | None = None, date_to: datetime | None = None) -> list:
+    """WHERE clauses of the given /emails/filter predicates (also used by the bulk endpoints)."""
+    conditions = []
+    if sender:
+        conditions.append(func.lower(Email.sender) == sender.lower())
+    if read is not None:
+        conditions.append(Email.read == read)
+    if recipient:
+        conditions.append(Email.recipient == recipient)
+    if date_from:
+        conditions.append(Email.timestamp >= date_from)
+    if date_to:
+        conditions.append(Email.timestamp <= date_to)
+    return conditions
+
+
+def filter_query(sender: str | None = None, read: bool | None = None, recipient: str | None = None,
+                 date_from: datetime | None = None, date_to: datetime | None = None):
+    """GET /emails/filter: all given predicates combined in one query, newest first."""
+    conditions = filter_conditions(sender, read, recipient, date_from, date_to)
+    return select(Email).where(*conditions).order_by(Email.timestamp.desc(), Email.id.desc())
+
+
+def bulk_conditions(ids: list[int] | None = None, **filters) -> list:
+    """
+    WHERE clauses of a bulk operation: the given ids and /emails/filter
+    predicates, all combined with AND.
+
+    Raises:
+        ValueError: Neither ids nor any filter were given (the operation would hit every email).
+    """
+    conditions = filter_conditions(**filters)
+    if ids is not None:
+        conditions.append(Email.id.in_(ids))
+    if not conditions:
+        raise ValueError("Give email ids or at least one filter")
+    return conditions
+
+
+def bulk_update_query(conditions: list, **values):
+    """UPDATE of every matching email in one statement, returning the ids it changed."""
+    return (update(Email).where(*conditions).values(**values).returning(Email.id)
+            .execution_options(synchronize_session=False))
+
+
+def bulk_delete_query(conditions: list):
+    """DELETE of every matching email in one statement, returning the ids it removed."""
+    return (delete(Email).where(*conditions).returning(Email.id)
+            .execution_options(synchronize_session=False))
+
+
+def encode_cursor(position: dict) -> str:
+    """Opaque, URL-safe page cursor."""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Inverse of encode_cursor.
+
+    Raises:
+        ValueError: The cursor is malformed.
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(position, dict):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return position
+
+
+async def keyset_page(db: AsyncSession, query, limit: int, cursor: str | None = None) -> tuple[list[Email], str | None]:
+    """
+    One page of a newest-first query from this module, continuing after the
+    (timestamp, id) position stored in `cursor`. Unlike OFFSET, every page is
+    a single index range scan, however deep into the mailbox it is.
+
+    Returns:
+        tuple: (emails, cursor of the next page or None on the last page).
+
+    Raises:
+        ValueError: The cursor is malformed.
+    """
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            after = (datetime.fromisoformat(position["t"]), int(position["id"]))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from e
+        query = query.where(tuple_(Email.timestamp, Email.id) < tuple_(*after))
+
+    emails = (await db.scalars(query.limit(limit + 1))).all()
+    if len(emails) <= limit:
+        return emails, None
+    last = emails[limit - 1]
+    return emails[:limit], encode_cursor({"t": last.timestamp.isoformat(), "id": last.id})
+
+
+def with_fields(query, fields: list[str] | None):
+    """Load only the given columns (plus id and timestamp, needed for paging)."""
+    if not fields:
+        return query
+    columns = {"id", "timestamp", *fields}
+    return query.options(load_only(*(getattr(Email, name) for name in columns)))
+
+
+def endpoint_queries() -> dict:
+    """Representative query of every list endpoint / filter combination, by label."""
+    day = datetime(2025, 1, 1)
+    return {
+        "GET /emails": list_query(),
+        "GET /emails/unread": unread_query(),
+        "GET /emails/filter?sender&read": filter_query(sender="boss@email.com", read=False),
+        "GET /emails/filter?read": filter_query(read=True),
+        "GET /emails/filter?recipient": filter_query(recipient="you@email.com"),
+        "GET /emails/filter?recipient&date_from&date_to": filter_query(
+            recipient="you@email.com", date_from=day, date_to=day),
+        "GET /emails/filter?date_from&date_to": filter_query(date_from=day, date_to=day),
+        "GET /emails?cursor": list_query().where(tuple_(Email.timestamp, Email.id) < tuple_(day, 1)),
+        "GET /emails/unread?cursor": unread_query().where(tuple_(Email.timestamp, Email.id) < tuple_(day, 1)),
+    }
+
+
+def compile_query(query, dialect) -> tuple[str, tuple]:
+    """A statement as (SQL string, positional parameters) for the sqlite3 driver."""
+    compiled = query.compile(dialect=dialect)
+    return str(compiled), tuple(compiled.params[name] for name in compiled.positiontup)
+
+
+def explain_query_plan(conn: Connection, query) -> list[str]:
+    """SQLite's EXPLAIN QUERY PLAN for a statement, one line per plan step."""
+    sql, params = compile_query(query, conn.dialect)
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def plan_problems(plan: list[str]) -> list[str]:
+    """Plan steps that read the whole table or sort it in a temporary B-tree."""
+    return [
+        step for step in plan
+        if (step.startswith("SCAN ") and "USING" not in step and "VIRTUAL TABLE" not in step)
+        or "USE TEMP B-TREE" in step
+    ]
+
+
+def check_query_plans(conn: Connection) -> dict:
+    """
+    Run EXPLAIN QUERY PLAN on every endpoint query and log a warning for each
+    one that falls back to a full table scan or a sort, e.g. after an index
+    was dropped or a new filter was added without one. Takes a sync connection;
+    from async code use `await conn.run_sync(check_query_plans)`.
+
+    Returns:
+        dict: label -> problematic plan steps (empty list when the plan is fine).
+    """
+    problems = {}
+    for label, query in endpoint_queries().items():
+        problems[label] = plan_problems(explain_query_plan(conn, query))
+        if problems[label]:
+            logger.warning("%s is not served by an index: %s", label, "; ".join(problems[label]))
+    return problems
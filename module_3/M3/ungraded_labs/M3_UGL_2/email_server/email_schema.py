@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
 from datetime import datetime
 from pydantic import ConfigDict  
 
@@ -18,3 +19,16 @@ class EmailOut(BaseModel):
 
     model_config = ConfigDict(from_attributes=True) 
 
+
+class EmailBulkSelect(BaseModel):
+    """Emails a bulk operation applies to: the listed ids and/or the /emails/filter predicates, combined with AND."""
+    ids: Optional[List[int]] = Field(None, max_length=1000)
+    sender: Optional[str] = None
+    read: Optional[bool] = None
+    recipient: Optional[str] = None
+    date_from: Optional[str] = None  # YYYY-MM-DD
+    date_to: Optional[str] = None    # YYYY-MM-DD
+
+class BulkResult(BaseModel):
+    count: int
+    ids: List[int]
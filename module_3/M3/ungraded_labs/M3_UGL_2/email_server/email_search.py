@@ -0,0 +1,121 @@
+from sqlalchemy import Connection, select, text
+from .email_models import Email
+import re
+
+# bm25 column weights for (subject, body, sender): subject hits rank highest
+SUBJECT_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+SENDER_WEIGHT = 3.0
+# Matches are ranked in windows of RANK_WINDOW, newest first, which bounds the
+# cost of very common words; paging moves on to the next (older) window.
+RANK_WINDOW = 2000
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# External-content FTS5 table over emails(subject, body, sender), kept in sync
+# by triggers so every insert/update/delete (ORM or raw SQL) updates the index.
+_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS emails_fts USING fts5(
+        subject, body, sender,
+        content='emails', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS emails_fts_ai AFTER INSERT ON emails BEGIN
+        INSERT INTO emails_fts(rowid, subject, body, sender)
+        VALUES (new.id, new.subject, new.body, new.sender);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS emails_fts_ad AFTER DELETE ON emails BEGIN
+        INSERT INTO emails_fts(emails_fts, rowid, subject, body, sender)
+        VALUES ('delete', old.id, old.subject, old.body, old.sender);
+    END
+    """,
+    # Only text changes touch the index; marking read/unread does not
+    """
+    CREATE TRIGGER IF NOT EXISTS emails_fts_au AFTER UPDATE OF subject, body, sender ON emails BEGIN
+        INSERT INTO emails_fts(emails_fts, rowid, subject, body, sender)
+        VALUES ('delete', old.id, old.subject, old.body, old.sender);
+        INSERT INTO emails_fts(rowid, subject, body, sender)
+        VALUES (new.id, new.subject, new.body, new.sender);
+    END
+    """,
+]
+
+
+def create_search_index(conn: Connection) -> None:
+    """
+    Create the FTS5 index and its sync triggers if missing. Emails that were
+    already in the database (e.g. an emails.db from before the index existed)
+    are indexed once, when the table is first created. Takes a sync connection
+    in a transaction; from async code use `await conn.run_sync(create_search_index)`.
+    """
+    existed = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'emails_fts'")
+    ).first() is not None
+    for statement in _FTS_DDL:
+        conn.execute(text(statement))
+    if not existed:
+        conn.execute(text("INSERT INTO emails_fts(emails_fts) VALUES ('rebuild')"))
+
+
+def fts_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression. Every whitespace-separated
+    term must appear as a word prefix ("quart rep" matches "Quarterly Report");
+    terms made of several words, like "boss@email.com", must appear as a phrase.
+    Returns "" when the text has no searchable words.
+    """
+    phrases = []
+    for term in q.split():
+        tokens = _TOKEN_RE.findall(term)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"*')
+    return " ".join(phrases)
+
+
+def _window_filter(before: int | None) -> str:
+    return "" if before is None else " AND rowid < :before"
+
+
+def search_query(q: str, limit: int, offset: int = 0, before: int = None):
+    """
+    select() of the emails matching `q` in subject, body or sender, best match
+    first (bm25, ties broken by newest), at most `limit` of them starting at
+    position `offset` of that ranking. The ranking covers one window: the
+    newest RANK_WINDOW matches with an id below `before` (or all ids);
+    `next_window` tells where the following window starts.
+    Returns None when `q` has no searchable words.
+    """
+    match = fts_query(q)
+    if not match:
+        return None
+    statement = text(
+        "SELECT emails.* FROM ("
+        "  SELECT rowid, bm25(emails_fts, :subject_w, :body_w, :sender_w) AS score FROM emails_fts"
+        f"  WHERE emails_fts MATCH :match{_window_filter(before)} ORDER BY rowid DESC LIMIT :window"
+        ") AS hits JOIN emails ON emails.id = hits.rowid "
+        "ORDER BY hits.score, emails.timestamp DESC, emails.id DESC "
+        "LIMIT :limit OFFSET :offset"
+    ).bindparams(
+        match=match, subject_w=SUBJECT_WEIGHT, body_w=BODY_WEIGHT, sender_w=SENDER_WEIGHT,
+        window=RANK_WINDOW, limit=limit, offset=offset,
+        **({} if before is None else {"before": before}),
+    )
+    return select(Email).from_statement(statement)
+
+
+def next_window(q: str, before: int = None):
+    """
+    Statement returning the `before` bound of the window after the one
+    `search_query(q, ..., before=before)` ranks, or no row when that window
+    holds the oldest matches. Only walks the index; nothing is ranked.
+    """
+    return text(
+        "SELECT rowid + 1 FROM emails_fts"
+        f" WHERE emails_fts MATCH :match{_window_filter(before)}"
+        " ORDER BY rowid DESC LIMIT 1 OFFSET :window"
+    ).bindparams(match=fts_query(q), window=RANK_WINDOW, **({} if before is None else {"before": before}))
@@ -1,14 +1,17 @@
 from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.templating import Jinja2Templates
 from typing import List
-from sqlalchemy.orm import Session
-from .email_database import SessionLocal, engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from .email_database import AsyncSessionLocal, async_engine
 from .email_models import Base, Email
-from .email_schema import EmailCreate, EmailOut
+from .email_schema import BulkResult, EmailBulkSelect, EmailCreate, EmailOut
+from . import email_queries, email_search
 from datetime import datetime
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import delete
-from fastapi.responses import FileResponse, HTMLResponse
+from sqlalchemy.schema import CreateIndex
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 import random
@@ -16,6 +19,8 @@ import os
 
 app = FastAPI(title="Email Simulation API")
 
+SEARCH_LIMIT = 100  # default number of /emails/search results
+
 # --- CORS (dev-friendly; ajusta si quieres restringir) ---
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
 # --- Archivos estáticos (monta si existe carpeta) ---
@@ -58,21 +64,24 @@ async def serve_ui(request: Request):
     )
 
 # --- DB setup ---
-Base.metadata.create_all(bind=engine)
+@app.on_event("startup")
+async def create_database():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all skips indexes of tables that already exist (e.g. an older emails.db)
+        for index in Email.__table__.indexes:
+            await conn.execute(CreateIndex(index, if_not_exists=True))
+        await conn.run_sync(email_search.create_search_index)
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 @app.on_event("startup")
-def preload_emails():
-    db = SessionLocal()
-    try:
-        db.execute(delete(Email))
-        db.commit()
+async def preload_emails():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Email))
+        await db.commit()
 
         now = datetime.utcnow()
         samples = [
@@ -97,14 +106,83 @@ def preload_emails():
         ]
         random.shuffle(samples)
         db.add_all(samples)
-        db.commit()
-    finally:
-        db.close()
+        await db.commit()
+
+@app.on_event("startup")
+async def check_query_plans():
+    # Warns (via logging) about any list endpoint query that would scan the whole table
+    async with async_engine.connect() as conn:
+        await conn.run_sync(email_queries.check_query_plans)
+
+# --- Pagination / projection shared by the list endpoints ---
+
+class PageParams:
+    """
+    ?limit=&cursor=&fields= on the list endpoints. Without limit and cursor
+    every matching email is returned, as before. Otherwise one page is returned
+    and the next one is announced in the X-Next-Cursor (and Link) header.
+    """
+
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=email_queries.MAX_PAGE_SIZE,
+                                  description="Page size; enables pagination"),
+        cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+        fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,sender,subject"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+    @property
+    def paged(self) -> bool:
+        return self.limit is not None or bool(self.cursor)
+
+    def field_list(self) -> list[str] | None:
+        if not self.fields:
+            return None
+        names = [name.strip() for name in self.fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in EmailOut.model_fields]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(EmailOut.model_fields)}",
+            )
+        return ["id"] + [name for name in names if name != "id"]  # id is always returned
+
+def email_list_response(request: Request, emails: list, fields: list[str] | None, next_cursor: str | None):
+    fields = fields or list(EmailOut.model_fields)
+    content = jsonable_encoder([{name: getattr(email, name) for name in fields} for email in emails])
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return JSONResponse(content, headers=headers)
+
+async def paged_list_response(request: Request, db: AsyncSession, query, page: PageParams):
+    fields = page.field_list()
+    query = email_queries.with_fields(query, fields)
+    if not page.paged:
+        return email_list_response(request, (await db.scalars(query)).all(), fields, None)
+    try:
+        emails, next_cursor = await email_queries.keyset_page(
+            db, query, page.limit or email_queries.DEFAULT_PAGE_SIZE, page.cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return email_list_response(request, emails, fields, next_cursor)
+
+def parse_date(value: str | None, name: str) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} format. Use YYYY-MM-DD")
 
 # --- API ---
 
 @app.post("/send", response_model=EmailOut)
-def send_email(email: EmailCreate, db: Session = Depends(get_db)):
+async def send_email(email: EmailCreate, db: AsyncSession = Depends(get_db)):
     new_email = Email(
         recipient=email.recipient,
         subject=email.subject,
@@ -112,99 +190,142 @@ def send_email(email: EmailCreate, db: Session = Depends(get_db)):
         sender="you@mail.com",
     )
     db.add(new_email)
-    db.commit()
-    db.refresh(new_email)
+    await db.commit()  # the session keeps loaded attributes after commit, no refresh needed
     return new_email
 
 @app.get("/emails", response_model=List[EmailOut])
-def list_emails(db: Session = Depends(get_db)):
-    return db.query(Email).order_by(Email.timestamp.desc()).all()
+async def list_emails(request: Request, page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await paged_list_response(request, db, email_queries.list_query(), page)
 
 @app.get("/emails/search", response_model=List[EmailOut])
-def search_emails(
-    q: str = Query(..., description="Keyword to search in subject/body/sender"),
-    db: Session = Depends(get_db),
+async def search_emails(
+    request: Request,
+    q: str = Query(..., description="Keywords to search in subject/body/sender (word prefixes match)"),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
 ):
-    return db.query(Email).filter(
-        (Email.subject.ilike(f"%{q}%")) |
-        (Email.body.ilike(f"%{q}%")) |
-        (Email.sender.ilike(f"%{q}%"))
-    ).order_by(Email.timestamp.desc()).all()
+    # Ranked by relevance within windows of older and older matches, so the
+    # cursor is a window ("b") plus a position in its ranking ("o")
+    limit = page.limit or SEARCH_LIMIT
+    offset, before = 0, None
+    if page.cursor:
+        try:
+            position = email_queries.decode_cursor(page.cursor)
+            offset = int(position["o"])
+            before = None if position.get("b") is None else int(position["b"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {page.cursor!r}")
+    query = email_search.search_query(q, limit + 1, offset, before)
+    emails = (await db.scalars(query)).all() if query is not None else []
+    next_cursor = None
+    if len(emails) > limit:
+        emails = emails[:limit]
+        next_cursor = email_queries.encode_cursor({"o": offset + limit, "b": before})
+    elif query is not None:
+        # This window is used up; continue with the older matches, if any
+        next_before = (await db.execute(email_search.next_window(q, before))).scalar()
+        if next_before is not None:
+            next_cursor = email_queries.encode_cursor({"o": 0, "b": next_before})
+    return email_list_response(request, emails, page.field_list(), next_cursor)
 
 @app.get("/emails/filter", response_model=List[EmailOut])
-def filter_emails(
+async def filter_emails(
+    request: Request,
+    sender: str | None = Query(None, description="Sender email address, case-insensitive (optional)"),
+    read: bool | None = Query(None, description="true = only read, false = only unread (optional)"),
     recipient: str | None = Query(None, description="Recipient email address (optional)"),
     date_from: str | None = Query(None, description="Start date YYYY-MM-DD (optional)"),
     date_to: str | None = Query(None, description="End date YYYY-MM-DD (optional)"),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
 ):
-    query = db.query(Email)
+    date_from_dt = parse_date(date_from, "date_from")
+    date_to_dt = parse_date(date_to, "date_to")
 
-    if recipient:
-        query = query.filter(Email.recipient == recipient)
+    # All predicates are combined into one SQL query, so only matching rows are returned
+    query = email_queries.filter_query(sender, read, recipient, date_from_dt, date_to_dt)
+    return await paged_list_response(request, db, query, page)
 
-    if date_from:
-        try:
-            date_from_dt = datetime.strptime(date_from, "%Y-%m-%d")
-            query = query.filter(Email.timestamp >= date_from_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date_from format. Use YYYY-MM-DD")
+@app.get("/emails/unread", response_model=List[EmailOut])
+async def get_unread_emails(request: Request, page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await paged_list_response(request, db, email_queries.unread_query(), page)
 
-    if date_to:
-        try:
-            date_to_dt = datetime.strptime(date_to, "%Y-%m-%d")
-            query = query.filter(Email.timestamp <= date_to_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date_to format. Use YYYY-MM-DD")
+# --- Bulk operations: one statement and one commit for any number of emails ---
+# Declared before /emails/{email_id} so "bulk" is not taken for an email id
 
-    return query.order_by(Email.timestamp.desc()).all()
+def bulk_conditions(selection: EmailBulkSelect) -> list:
+    try:
+        return email_queries.bulk_conditions(
+            ids=selection.ids,
+            sender=selection.sender,
+            read=selection.read,
+            recipient=selection.recipient,
+            date_from=parse_date(selection.date_from, "date_from"),
+            date_to=parse_date(selection.date_to, "date_to"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@app.get("/emails/unread", response_model=List[EmailOut])
-def get_unread_emails(db: Session = Depends(get_db)):
-    return db.query(Email).filter(Email.read == False).order_by(Email.timestamp.desc()).all()
+async def run_bulk(db: AsyncSession, query) -> BulkResult:
+    ids = sorted((await db.scalars(query)).all())
+    await db.commit()
+    return BulkResult(count=len(ids), ids=ids)
+
+@app.patch("/emails/bulk/read", response_model=BulkResult)
+async def bulk_mark_as_read(selection: EmailBulkSelect, db: AsyncSession = Depends(get_db)):
+    # Only unread rows are rewritten; the result lists the emails that changed
+    conditions = bulk_conditions(selection) + [Email.read == False]
+    return await run_bulk(db, email_queries.bulk_update_query(conditions, read=True))
+
+@app.patch("/emails/bulk/unread", response_model=BulkResult)
+async def bulk_mark_as_unread(selection: EmailBulkSelect, db: AsyncSession = Depends(get_db)):
+    conditions = bulk_conditions(selection) + [Email.read == True]
+    return await run_bulk(db, email_queries.bulk_update_query(conditions, read=False))
+
+@app.post("/emails/bulk/delete", response_model=BulkResult)
+async def bulk_delete(selection: EmailBulkSelect, db: AsyncSession = Depends(get_db)):
+    return await run_bulk(db, email_queries.bulk_delete_query(bulk_conditions(selection)))
 
 @app.get("/emails/{email_id}", response_model=EmailOut)
-def get_email(email_id: int, db: Session = Depends(get_db)):
-    email = db.query(Email).filter(Email.id == email_id).first()
+async def get_email(email_id: int, db: AsyncSession = Depends(get_db)):
+    email = await db.get(Email, email_id)
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
     return email
 
 @app.patch("/emails/{email_id}/read", response_model=EmailOut)
-def mark_email_as_read(email_id: int, db: Session = Depends(get_db)):
-    email = db.query(Email).filter(Email.id == email_id).first()
+async def mark_email_as_read(email_id: int, db: AsyncSession = Depends(get_db)):
+    email = await db.get(Email, email_id)
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
     email.read = True
-    db.commit()
-    db.refresh(email)
+    await db.commit()
     return email
 
 @app.patch("/emails/{email_id}/unread", response_model=EmailOut)
-def mark_email_as_unread(email_id: int, db: Session = Depends(get_db)):
-    email = db.query(Email).filter(Email.id == email_id).first()
+async def mark_email_as_unread(email_id: int, db: AsyncSession = Depends(get_db)):
+    email = await db.get(Email, email_id)
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
     email.read = False
-    db.commit()
-    db.refresh(email)
+    await db.commit()
     return email
 
 @app.delete("/emails/{email_id}")
-def delete_email(email_id: int, db: Session = Depends(get_db)):
-    email = db.query(Email).filter(Email.id == email_id).first()
+async def delete_email(email_id: int, db: AsyncSession = Depends(get_db)):
+    email = await db.get(Email, email_id)
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
-    db.delete(email)
-    db.commit()
+    await db.delete(email)
+    await db.commit()
     return {"message": "Email deleted"}
 
 @app.get("/reset_database")
-def reset_database():
-    preload_emails()
+async def reset_database():
+    await preload_emails()
     return {"message": "Database reset and emails reloaded"}
 
 # Salud/diagnóstico rápido
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
@@ -1,16 +1,45 @@
 from dotenv import load_dotenv
-import requests
 import os
 
+from .http_client import get_session
+
 load_dotenv()
 
 BASE_URL = os.getenv("M3_EMAIL_SERVER_API_URL")
 
+# Pooled keep-alive session with default timeouts, shared by every tool
+session = get_session()
+
 
-def list_all_emails() -> list:
+def _get_email_list(path: str, params: dict, limit: int = None, cursor: str = None, fields: str = None):
+    """
+    GET a list endpoint. Returns the plain list, or one page plus the cursor of
+    the next one (from the X-Next-Cursor header) when `limit` or `cursor` is given.
+    """
+    params = dict(params)
+    if limit:
+        params["limit"] = limit
+    if cursor:
+        params["cursor"] = cursor
+    if fields:
+        params["fields"] = fields
+    response = session.get(f"{BASE_URL}{path}", params=params)
+    if not (limit or cursor) or response.status_code != 200:
+        return response.json()
+    return {"emails": response.json(), "next_cursor": response.headers.get("X-Next-Cursor")}
+
+
+def list_all_emails(limit: int = None, cursor: str = None, fields: str = None) -> list | dict:
     """
     Fetch all emails stored in the system, ordered from newest to oldest.
 
+    Args:
+        limit (int): Page size (optional). When set, returns one page as
+            {"emails": [...], "next_cursor": str or None}.
+        cursor (str): `next_cursor` of the previous page, to fetch the next one (optional).
+        fields (str): Comma-separated fields to return, e.g. "id,sender,subject,timestamp",
+            to list emails without their bodies (optional; `id` is always included).
+
     Returns:
         List[dict]: A list of all emails including read and unread, 
         each represented as a dictionary with keys:
@@ -21,45 +50,76 @@ def list_all_emails() -> list:
         - body
         - timestamp
         - read (boolean)
+        With `limit` or `cursor`: {"emails": [...], "next_cursor": ...}; pass
+        `next_cursor` back as `cursor` until it is None.
     """
-    return requests.get(f"{BASE_URL}/emails").json()
+    return _get_email_list("/emails", {}, limit, cursor, fields)
 
 
-def list_unread_emails() -> list:
+def list_unread_emails(limit: int = None, cursor: str = None, fields: str = None) -> list | dict:
     """
     Fetch all unread emails only.
 
+    Args:
+        limit (int): Page size (optional). When set, returns one page as
+            {"emails": [...], "next_cursor": str or None}.
+        cursor (str): `next_cursor` of the previous page, to fetch the next one (optional).
+        fields (str): Comma-separated fields to return, e.g. "id,sender,subject,timestamp",
+            to list emails without their bodies (optional; `id` is always included).
+
     Returns:
         List[dict]: A list of unread emails (where `read == False`), 
         ordered from newest to oldest. Same structure as `list_all_emails`.
+        With `limit` or `cursor`: {"emails": [...], "next_cursor": ...}; pass
+        `next_cursor` back as `cursor` until it is None.
     """
-    return requests.get(f"{BASE_URL}/emails/unread").json()
+    return _get_email_list("/emails/unread", {}, limit, cursor, fields)
 
 
-def search_emails(query: str) -> list:
+def search_emails(query: str, limit: int = None, cursor: str = None, fields: str = None) -> list | dict:
     """
-    Search emails containing the query in subject, body, or sender.
+    Search emails whose subject, body, or sender contain every word of the query
+    (word prefixes match, e.g. "quart rep" finds "Quarterly Report").
 
     Args:
-        query (str): A keyword or phrase to search for.
+        query (str): Keywords to search for.
+        limit (int): Page size (optional). When set, returns one page as
+            {"emails": [...], "next_cursor": str or None}.
+        cursor (str): `next_cursor` of the previous page, to fetch the next one (optional).
+        fields (str): Comma-separated fields to return, e.g. "id,sender,subject,timestamp",
+            to list emails without their bodies (optional; `id` is always included).
 
     Returns:
-        List[dict]: A list of emails matching the query string.
+        List[dict]: Matching emails, best match first (at most 100).
+        With `limit` or `cursor`: {"emails": [...], "next_cursor": ...}; pass
+        `next_cursor` back as `cursor` until it is None.
     """
-    return requests.get(f"{BASE_URL}/emails/search", params={"q": query}).json()
+    return _get_email_list("/emails/search", {"q": query}, limit, cursor, fields)
 
 
-def filter_emails(recipient: str = None, date_from: str = None, date_to: str = None) -> list:
+def filter_emails(recipient: str = None, date_from: str = None, date_to: str = None,
+                  sender: str = None, read: bool = None,
+                  limit: int = None, cursor: str = None, fields: str = None) -> list | dict:
     """
-    Filter emails based on recipient and/or a date range.
+    Filter emails by any combination of recipient, date range, sender and read state.
+    The filtering happens on the server, so only matching emails are returned.
 
     Args:
         recipient (str): Email address to filter by (optional).
         date_from (str): Start date in 'YYYY-MM-DD' format (optional).
         date_to (str): End date in 'YYYY-MM-DD' format (optional).
+        sender (str): Sender email address, case-insensitive (optional).
+        read (bool): True for read emails only, False for unread only (optional).
+        limit (int): Page size (optional). When set, returns one page as
+            {"emails": [...], "next_cursor": str or None}.
+        cursor (str): `next_cursor` of the previous page, to fetch the next one (optional).
+        fields (str): Comma-separated fields to return, e.g. "id,sender,subject,timestamp",
+            to list emails without their bodies (optional; `id` is always included).
 
     Returns:
         List[dict]: A list of emails matching the given filters.
+        With `limit` or `cursor`: {"emails": [...], "next_cursor": ...}; pass
+        `next_cursor` back as `cursor` until it is None.
     """
     params = {}
     if recipient:
@@ -68,8 +128,12 @@ def filter_emails(recipient: str = None, date_from: str = None, date_to: str = N
         params["date_from"] = date_from
     if date_to:
         params["date_to"] = date_to
+    if sender:
+        params["sender"] = sender
+    if read is not None:
+        params["read"] = "true" if read else "false"
 
-    return requests.get(f"{BASE_URL}/emails/filter", params=params).json()
+    return _get_email_list("/emails/filter", params, limit, cursor, fields)
 
 
 def get_email(email_id: int) -> dict:
@@ -82,7 +146,7 @@ def get_email(email_id: int) -> dict:
     Returns:
         dict: A single email record if found, else raises HTTP 404.
     """
-    return requests.get(f"{BASE_URL}/emails/{email_id}").json()
+    return session.get(f"{BASE_URL}/emails/{email_id}").json()
 
 
 def mark_email_as_read(email_id: int) -> dict:
@@ -95,7 +159,7 @@ def mark_email_as_read(email_id: int) -> dict:
     Returns:
         dict: The updated email record with `read: true`.
     """
-    return requests.patch(f"{BASE_URL}/emails/{email_id}/read").json()
+    return session.patch(f"{BASE_URL}/emails/{email_id}/read").json()
 
 
 def mark_email_as_unread(email_id: int) -> dict:
@@ -108,7 +172,7 @@ def mark_email_as_unread(email_id: int) -> dict:
     Returns:
         dict: The updated email record with `read: false`.
     """
-    return requests.patch(f"{BASE_URL}/emails/{email_id}/unread").json()
+    return session.patch(f"{BASE_URL}/emails/{email_id}/unread").json()
 
 
 def send_email(recipient: str, subject: str, body: str) -> dict:
@@ -128,7 +192,7 @@ def send_email(recipient: str, subject: str, body: str) -> dict:
         "subject": subject,
         "body": body
     }
-    return requests.post(f"{BASE_URL}/send", json=payload).json()
+    return session.post(f"{BASE_URL}/send", json=payload).json()
 
 
 def delete_email(email_id: int) -> dict:
@@ -141,18 +205,99 @@ def delete_email(email_id: int) -> dict:
     Returns:
         dict: A confirmation message: {"message": "Email deleted"}
     """
-    return requests.delete(f"{BASE_URL}/emails/{email_id}").json()
+    return session.delete(f"{BASE_URL}/emails/{email_id}").json()
+
+
+def _bulk(method: str, path: str, email_ids: str = None, **filters) -> dict:
+    """Send one bulk request selecting emails by comma-separated ids and/or filters."""
+    payload = {name: value for name, value in filters.items() if value is not None and value != ""}
+    if email_ids:
+        parts = [part.strip() for part in str(email_ids).strip("[]").split(",") if part.strip()]
+        invalid = [part for part in parts if not part.isdecimal()]
+        if invalid:
+            return {"error": f"Invalid email ids {', '.join(invalid)}: expected comma-separated numbers, e.g. \"3,7,12\""}
+        payload["ids"] = [int(part) for part in parts]
+    return session.request(method, f"{BASE_URL}{path}", json=payload).json()
+
+
+def mark_emails_as_read(email_ids: str = None, sender: str = None, recipient: str = None,
+                        date_from: str = None, date_to: str = None) -> dict:
+    """
+    Mark many emails as read in a single call, e.g. "mark all from bob as read".
+    Emails are selected by ids and/or filters (all given criteria must match);
+    at least one of them is required.
+
+    Args:
+        email_ids (str): Comma-separated email IDs, e.g. "3,7,12" (optional).
+        sender (str): Only emails from this sender, case-insensitive (optional).
+        recipient (str): Only emails to this recipient (optional).
+        date_from (str): Start date in 'YYYY-MM-DD' format (optional).
+        date_to (str): End date in 'YYYY-MM-DD' format (optional).
+
+    Returns:
+        dict: {"count": n, "ids": [...]} with the emails that were unread and are now read.
+    """
+    return _bulk("PATCH", "/emails/bulk/read", email_ids, sender=sender, recipient=recipient,
+                 date_from=date_from, date_to=date_to)
+
+
+def mark_emails_as_unread(email_ids: str = None, sender: str = None, recipient: str = None,
+                          date_from: str = None, date_to: str = None) -> dict:
+    """
+    Mark many emails as unread in a single call. Emails are selected by ids
+    and/or filters (all given criteria must match); at least one of them is required.
+
+    Args:
+        email_ids (str): Comma-separated email IDs, e.g. "3,7,12" (optional).
+        sender (str): Only emails from this sender, case-insensitive (optional).
+        recipient (str): Only emails to this recipient (optional).
+        date_from (str): Start date in 'YYYY-MM-DD' format (optional).
+        date_to (str): End date in 'YYYY-MM-DD' format (optional).
+
+    Returns:
+        dict: {"count": n, "ids": [...]} with the emails that were read and are now unread.
+    """
+    return _bulk("PATCH", "/emails/bulk/unread", email_ids, sender=sender, recipient=recipient,
+                 date_from=date_from, date_to=date_to)
+
+
+def delete_emails(email_ids: str = None, sender: str = None, read: bool = None, recipient: str = None,
+                  date_from: str = None, date_to: str = None) -> dict:
+    """
+    Delete many emails in a single call, e.g. "delete all read emails from bob".
+    Emails are selected by ids and/or filters (all given criteria must match);
+    at least one of them is required.
+
+    Args:
+        email_ids (str): Comma-separated email IDs, e.g. "3,7,12" (optional).
+        sender (str): Only emails from this sender, case-insensitive (optional).
+        read (bool): True for read emails only, False for unread only (optional).
+        recipient (str): Only emails to this recipient (optional).
+        date_from (str): Start date in 'YYYY-MM-DD' format (optional).
+        date_to (str): End date in 'YYYY-MM-DD' format (optional).
+
+    Returns:
+        dict: {"count": n, "ids": [...]} with the emails that were deleted.
+    """
+    return _bulk("POST", "/emails/bulk/delete", email_ids, sender=sender, read=read, recipient=recipient,
+                 date_from=date_from, date_to=date_to)
 
 
-def search_unread_from_sender(sender: str) -> list:
+def search_unread_from_sender(sender: str, limit: int = None, cursor: str = None, fields: str = None) -> list | dict:
     """
     Return all unread emails from a specific sender (case-insensitive match).
 
     Args:
         sender (str): The email address of the sender to search for.
+        limit (int): Page size (optional). When set, returns one page as
+            {"emails": [...], "next_cursor": str or None}.
+        cursor (str): `next_cursor` of the previous page, to fetch the next one (optional).
+        fields (str): Comma-separated fields to return, e.g. "id,sender,subject,timestamp",
+            to list emails without their bodies (optional; `id` is always included).
 
     Returns:
         List[dict]: A list of unread emails where the sender matches the given address.
+        With `limit` or `cursor`: {"emails": [...], "next_cursor": ...}; pass
+        `next_cursor` back as `cursor` until it is None.
     """
-    unread = list_unread_emails()
-    return [e for e in unread if e['sender'].lower() == sender.lower()]
+    return filter_emails(sender=sender, read=False, limit=limit, cursor=cursor, fields=fields)
@@ -0,0 +1,65 @@
+from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
+import threading
+import os
+
+load_dotenv()
+
+# Timeouts (seconds) and connection pool size, overridable from .env
+CONNECT_TIMEOUT = float(os.getenv("EMAIL_HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("EMAIL_HTTP_READ_TIMEOUT", "30"))
+POOL_SIZE = int(os.getenv("EMAIL_HTTP_POOL_SIZE", "10"))
+USER_AGENT = "LF-ADP-EmailClient/1.0"
+
+
+class TimeoutSession(requests.Session):
+    """
+    requests.Session that applies a default (connect, read) timeout to every
+    request, so a stuck server can never hang a tool call forever.
+    """
+
+    def __init__(self, timeout: tuple):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(pool_size: int = POOL_SIZE, connect_timeout: float = CONNECT_TIMEOUT,
+                   read_timeout: float = READ_TIMEOUT) -> TimeoutSession:
+    """
+    Build a keep-alive HTTP session with a bounded connection pool.
+
+    Args:
+        pool_size (int): Connections kept open per host.
+        connect_timeout (float): Seconds to wait for a TCP connection.
+        read_timeout (float): Seconds to wait for the server to answer.
+
+    Returns:
+        TimeoutSession: The configured session.
+    """
+    session = TimeoutSession(timeout=(connect_timeout, read_timeout))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> TimeoutSession:
+    """
+    Shared session used by the email tools and the notebook test helpers,
+    so consecutive calls reuse the same TCP connections.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
@@ -17,7 +17,10 @@ from .email_tools import (
     mark_email_as_unread,
     send_email,
     delete_email,
-    search_unread_from_sender
+    search_unread_from_sender,
+    mark_emails_as_read,
+    mark_emails_as_unread,
+    delete_emails
 )
 
 load_dotenv()
@@ -62,7 +65,10 @@ async def handle_prompt(payload: PromptInput):
             mark_email_as_unread,
             send_email,
             delete_email,
-            search_unread_from_sender
+            search_unread_from_sender,
+            mark_emails_as_read,
+            mark_emails_as_unread,
+            delete_emails
         ],
         max_turns=20
     )
@@ -19,7 +19,7 @@ import base64
 from typing import Any
 
 # --- Local / project ---
-# (add your local imports here, e.g. `import utils`)
+from email_server.http_client import get_session
 
 # ================================
 # Environment & HTTP session
@@ -28,8 +28,8 @@ load_dotenv()  # loads .env from the working directory
 
 BASE_URL = os.getenv("M3_EMAIL_SERVER_API_URL")
 
-session = requests.Session()
-session.headers.update({"User-Agent": "LF-ADP-EmailClient/1.0"})
+# Pooled keep-alive session with default timeouts (shared with email_tools)
+session = get_session()
 
 
 # ================================
@@ -217,7 +217,7 @@ def call_llm_email_agent(prompt: str,
     endpoint = base if base.rstrip("/").endswith("/prompt") else urljoin(base.rstrip("/") + "/", "prompt")
 
     try:
-        r = requests.post(endpoint, json={"prompt": prompt}, timeout=timeout)
+        r = session.post(endpoint, json={"prompt": prompt}, timeout=timeout)
     except requests.RequestException as e:
         return {"ok": False, "status": None, "response": None, "raw": str(e)}
 
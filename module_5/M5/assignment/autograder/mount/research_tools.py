@@ -8,6 +8,9 @@ from dotenv import load_dotenv
 from tavily import TavilyClient
 import wikipedia
 
+# --- Local / project ---
+from tool_replay import replayable_tool
+
 # Init env
 load_dotenv()  # load variables 
 
@@ -17,6 +20,7 @@ session.headers.update({
     "User-Agent": "LF-ADP-Agent/1.0 (mailto:your.email@example.com)"
 })
 
+@replayable_tool("arxiv_search_tool")
 def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
     """
     Searches arXiv for research papers matching the given query.
@@ -86,6 +90,7 @@ arxiv_tool_def = {
 
 
 
+@replayable_tool("tavily_search_tool")
 def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict]:
     """
     Perform a search using the Tavily API.
@@ -167,6 +172,7 @@ tavily_tool_def = {
 
 ## Wikipedia search tool
 
+@replayable_tool("wikipedia_search_tool")
 def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
     """
     Searches Wikipedia for a summary of the given query.
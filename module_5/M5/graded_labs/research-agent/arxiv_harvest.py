@@ -0,0 +1,206 @@
+# --- Standard library ---
+import json
+import os
+import random
+import threading
+import time
+
+# --- Third-party ---
+import requests
+
+# --- Local / project ---
+import research_tools
+from research_tools import _AtomEntryStream, _arxiv_params, arxiv_id_from_url
+
+# arXiv asks API clients for no more than one request every three seconds
+DEFAULT_REQUESTS_PER_SECOND = 1 / 3
+DEFAULT_PAGE_SIZE = 100
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `acquire()` blocks until a request may be sent.
+
+    Args:
+        rate (float): Tokens added per second (sustained requests per second).
+        capacity (float): Maximum burst size.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _retry_delay(retry_after: str, attempt: int, backoff: float, max_backoff: float) -> float:
+    """Honours a numeric Retry-After header, else jittered exponential backoff."""
+    if retry_after and retry_after.strip().isdigit():
+        return min(float(retry_after), max_backoff)
+    return min(backoff * (2 ** attempt), max_backoff) * random.uniform(0.5, 1.5)
+
+
+def _fetch_page(
+    query: str,
+    start: int,
+    page_size: int,
+    bucket: TokenBucket,
+    api_url: str,
+    max_retries: int,
+    backoff: float,
+    max_backoff: float,
+    stats: dict,
+) -> tuple:
+    """
+    Downloads one page of results, retrying throttled or failed requests.
+
+    Returns:
+        tuple: (list of result dicts, totalResults reported by arXiv or None)
+    """
+    last_error = None
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        retry_after = None
+        try:
+            with research_tools.session.get(
+                api_url,
+                params=_arxiv_params(query, page_size, start),
+                timeout=research_tools.ARXIV_TIMEOUT,
+                stream=True
+            ) as response:
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = response.headers.get("Retry-After")
+                    last_error = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    parser = _AtomEntryStream()
+                    results = []
+                    for chunk in response.iter_content(chunk_size=16384):
+                        results.extend(parser.feed(chunk))
+                    results.extend(parser.close())
+
+                    # arXiv occasionally returns an empty page in the middle
+                    # of a result set; treat that as transient.
+                    total = parser.total_results
+                    if results or total is None or start >= total:
+                        return results, total
+                    last_error = "empty page before end of results"
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            last_error = str(e)
+
+        if attempt < max_retries:
+            stats["retries"] += 1
+            time.sleep(_retry_delay(retry_after, attempt, backoff, max_backoff))
+
+    raise RuntimeError(
+        f"arXiv request at start={start} failed after {max_retries + 1} attempts: {last_error}"
+    )
+
+
+def _load_seen_ids(path: str) -> set:
+    """Reads the arXiv ids already present in a JSONL harvest file."""
+    seen = set()
+    if not os.path.exists(path):
+        return seen
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                seen.add(json.loads(line)["arxiv_id"])
+    return seen
+
+
+def harvest_arxiv(
+    query: str,
+    out_path: str,
+    max_results: int = 1000,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start: int = 0,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    max_retries: int = 5,
+    backoff: float = 3.0,
+    max_backoff: float = 60.0,
+    api_url: str = None,
+    resume: bool = True,
+) -> dict:
+    """
+    Walks arXiv search results page by page and streams them to a JSONL file.
+
+    Each line holds the same dict `arxiv_search_tool` returns plus an
+    `arxiv_id` field. Papers are de-duplicated by arXiv id (also against
+    lines already in `out_path` when `resume` is True), and only one page is
+    held in memory at a time.
+
+    Args:
+        query (str): Search keywords.
+        out_path (str): JSONL file to append to (or overwrite if not resuming).
+        max_results (int): Maximum number of results to walk through.
+        page_size (int): Results requested per API call.
+        start (int): Offset of the first result.
+        requests_per_second (float): Request budget enforced by a token bucket.
+        max_retries (int): Retries per page on 429/5xx, timeouts and empty pages.
+        backoff (float): Base delay in seconds for exponential backoff.
+        max_backoff (float): Upper bound for a single retry delay.
+        api_url (str): Override of the arXiv endpoint (e.g. a local fake server).
+        resume (bool): Append to an existing file and skip ids already in it.
+
+    Returns:
+        dict: Counters {"written", "duplicates", "pages", "retries"}.
+    """
+    api_url = api_url or research_tools.ARXIV_API_URL
+    bucket = TokenBucket(requests_per_second)
+    seen = _load_seen_ids(out_path) if resume else set()
+    stats = {"written": 0, "duplicates": 0, "pages": 0, "retries": 0}
+
+    offset = start
+    end = start + max_results
+    with open(out_path, "a" if resume else "w", encoding="utf-8") as out:
+        while offset < end:
+            size = min(page_size, end - offset)
+            results, total = _fetch_page(
+                query, offset, size, bucket, api_url, max_retries, backoff, max_backoff, stats
+            )
+            stats["pages"] += 1
+
+            for result in results:
+                arxiv_id = arxiv_id_from_url(result.get("url")) or result.get("url")
+                if arxiv_id in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(arxiv_id)
+                out.write(json.dumps({**result, "arxiv_id": arxiv_id}) + "\n")
+                stats["written"] += 1
+            out.flush()
+
+            if total is not None:
+                end = min(end, total)
+            if not results:
+                break
+            offset += size
+
+    return stats
+
+
+def read_harvest(path: str):
+    """Yields the result dicts stored in a JSONL harvest file, one at a time."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
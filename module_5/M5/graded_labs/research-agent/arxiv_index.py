@@ -0,0 +1,182 @@
+# --- Standard library ---
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60  # papers older than this in the index are "stale"
+TITLE_WEIGHT = 10.0                 # BM25 column weights: a title hit counts 10x
+SUMMARY_WEIGHT = 1.0
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(query: str) -> str:
+    """
+    Turns free text into an FTS5 query that matches documents containing
+    every word (each term quoted, so operators and punctuation in the user's
+    text cannot break the query syntax). Returns "" if there are no words.
+    """
+    return " ".join(f'"{term}"' for term in _TERM_RE.findall(query.lower()))
+
+
+class ArxivIndex:
+    """
+    Local BM25 full-text index over arXiv results, stored in SQLite FTS5.
+
+    Papers are keyed by their version-less arXiv id; titles and abstracts are
+    indexed with the Porter stemmer. `search` only answers when it can return
+    a full page of fresh papers, so callers fall back to the network for
+    anything the index cannot fully cover.
+
+    Args:
+        path (str): SQLite database file (":memory:" for a throwaway index).
+        max_age (float): Seconds after which an indexed paper is stale.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                rowid INTEGER PRIMARY KEY,
+                arxiv_id TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                result TEXT NOT NULL,
+                indexed_at REAL NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                title, summary, content='papers', content_rowid='rowid',
+                tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+                INSERT INTO papers_fts(rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+                INSERT INTO papers_fts(papers_fts, rowid, title, summary)
+                VALUES ('delete', old.rowid, old.title, old.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+                INSERT INTO papers_fts(papers_fts, rowid, title, summary)
+                VALUES ('delete', old.rowid, old.title, old.summary);
+                INSERT INTO papers_fts(rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+            END;
+            """
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def add(self, results) -> int:
+        """
+        Adds or refreshes arXiv result dicts (as returned by
+        `arxiv_search_tool` or stored by `harvest_arxiv`). Error entries and
+        non-arXiv results are skipped. Returns the number of papers written.
+        """
+        from research_tools import arxiv_id_from_url
+
+        now = time.time()
+        rows = []
+        for item in results:
+            if not isinstance(item, dict) or "error" in item:
+                continue
+            arxiv_id = item.get("arxiv_id") or arxiv_id_from_url(item.get("url", ""))
+            if not arxiv_id:
+                continue
+            result = {k: v for k, v in item.items() if k != "arxiv_id"}
+            rows.append((arxiv_id, item.get("title", ""), item.get("summary", ""), json.dumps(result), now))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO papers (arxiv_id, title, summary, result, indexed_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(arxiv_id) DO UPDATE SET title = excluded.title, summary = excluded.summary, "
+                    "result = excluded.result, indexed_at = excluded.indexed_at",
+                    rows,
+                )
+            except BaseException:
+                # Never leave the shared connection inside an open transaction
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def search(self, query: str, max_results: int = 5, require_full: bool = True):
+        """
+        BM25-ranked papers matching every word of `query`.
+
+        Args:
+            query (str): Free-text search.
+            max_results (int): Maximum number of papers to return.
+            require_full (bool): If True, return None unless `max_results`
+                fresh papers match, signalling the caller to go to the network.
+
+        Returns:
+            list[dict] | None: Result dicts in the `arxiv_search_tool` shape.
+        """
+        match = fts_query(query)
+        if not match:
+            return None if require_full else []
+
+        cutoff = time.time() - self.max_age if self.max_age is not None else 0.0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.result FROM papers_fts JOIN papers p ON p.rowid = papers_fts.rowid "
+                "WHERE papers_fts MATCH ? AND p.indexed_at >= ? "
+                f"ORDER BY bm25(papers_fts, {TITLE_WEIGHT}, {SUMMARY_WEIGHT}) LIMIT ?",
+                (match, cutoff, max_results),
+            ).fetchall()
+
+        if require_full and len(rows) < max_results:
+            return None
+        return [json.loads(result) for (result,) in rows]
+
+    def purge_stale(self) -> int:
+        """Deletes papers older than `max_age`; returns how many were removed."""
+        if self.max_age is None:
+            return 0
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM papers WHERE indexed_at < ?", (time.time() - self.max_age,))
+        return cur.rowcount
+
+    def optimize(self) -> None:
+        """Merges FTS5 index segments (worth running after large bulk adds)."""
+        with self._lock:
+            self._conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('optimize')")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_arxiv_index():
+    """
+    Shared index consulted by `arxiv_search_tool`, or None when disabled.
+
+    Opt-in: set RESEARCH_TOOLS_ARXIV_INDEX to the database path, and
+    optionally RESEARCH_TOOLS_ARXIV_INDEX_MAX_AGE (seconds).
+    """
+    global _default_index
+    path = os.getenv("RESEARCH_TOOLS_ARXIV_INDEX")
+    if not path:
+        return None
+    with _default_index_lock:
+        if _default_index is None or _default_index.path != path:
+            _default_index = ArxivIndex(
+                path, max_age=float(os.getenv("RESEARCH_TOOLS_ARXIV_INDEX_MAX_AGE", DEFAULT_MAX_AGE))
+            )
+        return _default_index
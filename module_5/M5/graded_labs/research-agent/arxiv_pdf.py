@@ -0,0 +1,273 @@
+# --- Standard library ---
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# --- Third-party ---
+import requests
+
+# --- Local / project ---
+from research_tools import ARXIV_ATTEMPT_TIMEOUT, register_tool, resilient_session
+from tool_metrics import instrumented_tool
+from tool_registry import function_schema
+from tool_replay import lookup_fixture, record_fixture
+
+DEFAULT_PDF_DIR = ".arxiv_pdfs"
+DOWNLOAD_WORKERS = 3        # arXiv asks for gentle clients; keep this small
+EXTRACT_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_CHARS = 20000
+
+# ".../pdf/2401.01234v2", ".../abs/2401.01234", ".../pdf/hep-th/9901001v1.pdf"
+_PDF_URL_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/(.+?)(v\d+)?(?:\.pdf)?/?$", re.IGNORECASE)
+_BARE_ID_RE = re.compile(r"^(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(v\d+)?$")
+
+_download_pool = None
+_extract_pool = None
+_pools_lock = threading.Lock()
+_download_locks = {}  # destination path -> lock held while it is downloaded
+_download_locks_lock = threading.Lock()
+
+
+def _pools() -> tuple:
+    """Shared (download thread pool, extraction process pool), created on first use."""
+    global _download_pool, _extract_pool
+    with _pools_lock:
+        if _download_pool is None:
+            _download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="pdf-download")
+            # Forking a process that already runs the download threads can
+            # deadlock the child on a lock held mid-request; start clean workers.
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_WORKERS, mp_context=multiprocessing.get_context(method)
+            )
+        return _download_pool, _extract_pool
+
+
+def pdf_dir() -> str:
+    path = os.getenv("RESEARCH_TOOLS_PDF_DIR", DEFAULT_PDF_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def parse_pdf_reference(ref: str) -> tuple:
+    """
+    Splits an arXiv PDF/abstract URL or bare id into (arxiv_id, version),
+    e.g. "http://arxiv.org/pdf/2401.01234v2" -> ("2401.01234", "v2").
+    Version is "" when the reference does not pin one.
+
+    Raises:
+        ValueError: The reference is not an arXiv id or URL.
+    """
+    ref = (ref or "").strip()
+    match = _PDF_URL_RE.search(ref) or _BARE_ID_RE.match(ref)
+    if not match:
+        raise ValueError(f"Not an arXiv PDF reference: {ref!r}")
+    return match.group(1), match.group(2) or ""
+
+
+def _storage_name(arxiv_id: str, version: str) -> str:
+    return (arxiv_id + version).replace("/", "_")
+
+
+def download_pdf(url: str, dest: str) -> str:
+    """
+    Streams a PDF to `dest`, resuming from `dest + ".part"` with an HTTP
+    Range request if an earlier download was interrupted. Returns `dest`.
+    Concurrent calls for the same `dest` wait for one download.
+
+    Raises:
+        requests.exceptions.RequestException: Network or HTTP error.
+        ValueError: The response is not a PDF.
+    """
+    with _download_locks_lock:
+        lock = _download_locks.setdefault(dest, threading.Lock())
+    with lock:
+        return _download_to(url, dest)
+
+
+def _download_to(url: str, dest: str) -> str:
+    if os.path.exists(dest):
+        return dest
+
+    part = dest + ".part"
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    with resilient_session.get(url, headers=headers, timeout=ARXIV_ATTEMPT_TIMEOUT, stream=True) as response:
+        if response.status_code == 416:  # .part already holds the whole file
+            pass
+        else:
+            response.raise_for_status()
+            mode = "ab" if offset and response.status_code == 206 else "wb"
+            with open(part, mode) as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+
+    with open(part, "rb") as f:
+        if f.read(5) != b"%PDF-":
+            os.remove(part)
+            raise ValueError(f"Response from {url} is not a PDF")
+    os.replace(part, dest)
+    return dest
+
+
+def _extract_text(pdf_path: str, max_pages: int = None) -> str:
+    """Process-pool worker: plain text of a PDF, page by page."""
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ImportError("PDF text extraction needs the optional `pypdf` package (pip install pypdf)") from e
+
+    reader = PdfReader(pdf_path)
+    pages = reader.pages if max_pages is None else reader.pages[:max_pages]
+    return "\n\n".join((page.extract_text() or "").strip() for page in pages)
+
+
+def _text_path(arxiv_id: str, version: str) -> str:
+    return os.path.join(pdf_dir(), _storage_name(arxiv_id, version) + ".txt")
+
+
+def _cached_text(arxiv_id: str, version: str) -> str | None:
+    path = _text_path(arxiv_id, version)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    return None
+
+
+def _store_text(arxiv_id: str, version: str, text: str) -> None:
+    path = _text_path(arxiv_id, version)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+
+def _download(url: str, arxiv_id: str, version: str) -> str:
+    dest = os.path.join(pdf_dir(), _storage_name(arxiv_id, version) + ".pdf")
+    return download_pdf(url, dest)
+
+
+def _lookup_text_fixture(arxiv_id: str, version: str, max_pages: int) -> tuple:
+    """Recorded text of a paper under RESEARCH_TOOLS_REPLAY (see tool_replay)."""
+    return lookup_fixture("arxiv_pdf_text", arxiv_id + version, max_pages=max_pages)
+
+
+def _record_text_fixture(fixture: tuple, arxiv_id: str, version: str, text: str) -> None:
+    mode, key, _ = fixture
+    record_fixture(mode, key, "arxiv_pdf_text", arxiv_id + version, [{"full_text": text}])
+
+
+def fetch_paper_texts(results: list[dict], max_pages: int = None) -> list[dict]:
+    """
+    Downloads and extracts the full text of arXiv results.
+
+    PDFs are fetched with a small bounded thread pool; each finished
+    download is handed straight to a process pool for text extraction, so
+    parsing overlaps the remaining downloads (the call itself blocks until
+    every paper is done). Results pointing at the same arXiv id and version
+    share one download, and text is cached on disk per id and version, so
+    every paper is processed once (unversioned references keep the version
+    that was current when first fetched).
+    Under RESEARCH_TOOLS_REPLAY the text is recorded and replayed like a
+    tool response, so replay mode never downloads a PDF.
+
+    Args:
+        results (list[dict]): Results from `arxiv_search_tool` (need `link_pdf` or `url`).
+        max_pages (int): Only extract the first `max_pages` pages.
+
+    Returns:
+        list[dict]: Copies of the results with `full_text`, or `pdf_error`
+        when the paper could not be fetched or parsed, in input order.
+    """
+    download_pool, extract_pool = _pools()
+    items = [dict(item) for item in results]
+    groups = {}  # (arxiv_id, version) -> (url, items referring to it)
+    for item in items:
+        if "error" in item:
+            continue
+        url = item.get("link_pdf") or item.get("url", "").replace("/abs/", "/pdf/")
+        try:
+            key = parse_pdf_reference(url)
+        except ValueError as e:
+            item["pdf_error"] = str(e)
+            continue
+        groups.setdefault(key, (url, []))[1].append(item)
+
+    outcomes = {}   # (arxiv_id, version) -> {"full_text": ...} or {"pdf_error": ...}
+    downloads = {}  # download future -> ((arxiv_id, version), replay fixture)
+    for key, (url, _) in groups.items():
+        arxiv_id, version = key
+        fixture = _lookup_text_fixture(arxiv_id, version, max_pages)
+        mode, _, recorded = fixture
+        if recorded is not None:
+            outcomes[key] = {"full_text": recorded[0]["full_text"]}
+            continue
+        if mode == "replay":
+            outcomes[key] = {"pdf_error": f"No recorded text of {arxiv_id}{version} in replay mode"}
+            continue
+
+        text = _cached_text(arxiv_id, version)
+        if text is not None:
+            outcomes[key] = {"full_text": text}
+            _record_text_fixture(fixture, arxiv_id, version, text)
+            continue
+        downloads[download_pool.submit(_download, url, arxiv_id, version)] = (key, fixture)
+
+    # Submit extraction as soon as each download completes.
+    extractions = []
+    for future in as_completed(downloads):
+        key, fixture = downloads[future]
+        try:
+            extractions.append((key, fixture, extract_pool.submit(_extract_text, future.result(), max_pages)))
+        except (requests.exceptions.RequestException, ValueError, OSError) as e:
+            outcomes[key] = {"pdf_error": str(e)}
+
+    for key, fixture, extraction in extractions:
+        try:
+            text = extraction.result()
+            if max_pages is None:
+                _store_text(*key, text)
+            _record_text_fixture(fixture, *key, text)
+            outcomes[key] = {"full_text": text}
+        except Exception as e:
+            outcomes[key] = {"pdf_error": f"Text extraction failed: {str(e)}"}
+
+    for key, (_, group) in groups.items():
+        for item in group:
+            item.update(outcomes[key])
+    return items
+
+
+@instrumented_tool("arxiv_fulltext_tool")
+def arxiv_fulltext_tool(paper: str, max_chars: int = DEFAULT_MAX_CHARS) -> list[dict]:
+    """
+    Fetches the full text of an arXiv paper from its PDF, given its id or URL.
+
+    Args:
+        paper (str): arXiv id (e.g. 2401.01234v2) or abstract/PDF URL.
+        max_chars (int): Maximum number of characters of text to return.
+    """
+    try:
+        arxiv_id, version = parse_pdf_reference(paper)
+    except ValueError as e:
+        return [{"error": str(e)}]
+
+    url = f"https://arxiv.org/pdf/{arxiv_id}{version}"
+    result = fetch_paper_texts([{"url": url, "link_pdf": url}])[0]
+    if "pdf_error" in result:
+        return [{"error": result["pdf_error"]}]
+
+    text = result["full_text"]
+    return [{
+        "arxiv_id": arxiv_id + version,
+        "url": url,
+        "text": text[:max_chars],
+        "truncated": len(text) > max_chars,
+    }]
+
+
+arxiv_fulltext_tool_def = function_schema(arxiv_fulltext_tool)
+register_tool(arxiv_fulltext_tool)
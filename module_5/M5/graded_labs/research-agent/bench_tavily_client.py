@@ -0,0 +1,88 @@
+"""
+Per-call latency of `tavily_search_tool` with a fresh TavilyClient per call
+(the previous behaviour) versus the shared client from `get_tavily_client`.
+
+Runs entirely against a local stub of the Tavily /search endpoint:
+
+    python bench_tavily_client.py [calls]
+"""
+
+# --- Standard library ---
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_RESPONSE = json.dumps({
+    "query": "stub",
+    "results": [
+        {"title": f"Result {i}", "content": "Lorem ipsum " * 20, "url": f"https://example.com/{i}"}
+        for i in range(5)
+    ],
+    "images": [],
+}).encode("utf-8")
+
+
+class StubTavilyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # allow keep-alive
+    disable_nagle_algorithm = True  # avoid delayed-ACK stalls on reused connections
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(STUB_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _timed_calls(search, calls: int) -> list[float]:
+    timings = []
+    for i in range(calls):
+        start = time.perf_counter()
+        search(f"query {i}")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(timings):7.3f} ms   "
+          f"median {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def main(calls: int = 200) -> None:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubTavilyHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    os.environ["TAVILY_API_KEY"] = "tvly-benchmark"
+    os.environ["DLAI_TAVILY_BASE_URL"] = f"http://127.0.0.1:{httpd.server_address[1]}"
+    os.environ["RESEARCH_TOOLS_CACHE"] = "0"  # measure the client, not the cache
+
+    import research_tools
+    from tavily import TavilyClient
+
+    def fresh_client_search(query):
+        api_key, api_base_url = research_tools._tavily_settings()
+        client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
+        return research_tools._format_tavily_response(client.search(query=query, max_results=5), False)
+
+    try:
+        research_tools.tavily_search_tool("warm-up")
+        print(f"{calls} calls against local stub {os.environ['DLAI_TAVILY_BASE_URL']}")
+        _report("new client per call", _timed_calls(fresh_client_search, calls))
+        _report("shared client", _timed_calls(research_tools.tavily_search_tool, calls))
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
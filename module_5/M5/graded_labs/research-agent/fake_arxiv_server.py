@@ -0,0 +1,203 @@
+"""
+Local stand-in for the arXiv query API, for tests and benchmarks.
+
+Serves deterministic Atom feeds for any `search_query`, honours `start`,
+`max_results` and `id_list`, and can inject latency, stragglers and 429/503
+failures. Point the research tools at it with the ARXIV_API_URL environment
+variable (set before importing research_tools) or by passing `api_url` where
+supported:
+
+    with FakeArxivServer(total_results=500, fail_every=4) as server:
+        harvest_arxiv("transformers", "out.jsonl", api_url=server.url)
+
+Run standalone with `python fake_arxiv_server.py [port]`.
+"""
+
+# --- Standard library ---
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+FEED_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns="http://www.w3.org/2005/Atom" '
+    'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">\n'
+    '<title>arXiv Query: {query}</title>\n'
+    '<opensearch:totalResults>{total}</opensearch:totalResults>\n'
+    '<opensearch:startIndex>{start}</opensearch:startIndex>\n'
+    '<opensearch:itemsPerPage>{count}</opensearch:itemsPerPage>\n'
+)
+
+ENTRY_TEMPLATE = (
+    '<entry>\n'
+    '  <id>http://arxiv.org/abs/{arxiv_id}v1</id>\n'
+    '  <published>2024-01-{day:02d}T00:00:00Z</published>\n'
+    '  <title>Paper {index} on {query}</title>\n'
+    '  <summary>Synthetic abstract number {index} about {query}.</summary>\n'
+    '  <author><name>Author {index}</name></author>\n'
+    '  <link href="http://arxiv.org/abs/{arxiv_id}v1" rel="alternate" type="text/html"/>\n'
+    '  <link title="pdf" href="http://arxiv.org/pdf/{arxiv_id}v1" rel="related" type="application/pdf"/>\n'
+    '</entry>\n'
+)
+
+
+def fake_arxiv_id(index: int) -> str:
+    """Identifier of the index-th synthetic paper."""
+    return f"2401.{index:05d}"
+
+
+class FakeArxivServer:
+    """
+    Threaded HTTP server imitating export.arxiv.org/api/query.
+
+    Args:
+        total_results (int): Number of papers matching every query.
+        fail_every (int): If > 0, every n-th request fails with `fail_status`.
+        fail_status (int): HTTP status used for injected failures (429 or 503).
+        retry_after (int): Value of the Retry-After header on failures, or None.
+        latency (float): Seconds to sleep before answering each request.
+        slow_every (int): If > 0, every n-th request additionally sleeps
+            `slow_latency` seconds (a straggler, for hedging tests).
+        slow_latency (float): Extra delay of straggler requests.
+        duplicate_every (int): If > 0, every n-th paper repeats the previous
+            paper's id, to exercise de-duplication.
+        port (int): Port to bind on 127.0.0.1 (0 picks a free one).
+    """
+
+    def __init__(
+        self,
+        total_results: int = 250,
+        fail_every: int = 0,
+        fail_status: int = 503,
+        retry_after: int = None,
+        latency: float = 0.0,
+        slow_every: int = 0,
+        slow_latency: float = 5.0,
+        duplicate_every: int = 0,
+        port: int = 0,
+    ):
+        self.total_results = total_results
+        self.fail_every = fail_every
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.latency = latency
+        self.slow_every = slow_every
+        self.slow_latency = slow_latency
+        self.duplicate_every = duplicate_every
+        self.requests = []  # (path, status) per request served
+
+        self._received = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/query"
+
+    def start(self) -> "FakeArxivServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeArxivServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def paper_id(self, index: int) -> str:
+        if self.duplicate_every and index > 1 and index % self.duplicate_every == 0:
+            index -= 1
+        return fake_arxiv_id(index)
+
+    def render_feed(self, query: str, start: int, max_results: int, id_list: list = None) -> bytes:
+        if id_list:
+            # Known ids (2401.NNNNN[vN] within total_results) in request order
+            matches = (re.fullmatch(r"2401\.(\d{5})(?:v\d+)?", arxiv_id) for arxiv_id in id_list)
+            indexes = [
+                int(match.group(1)) for match in matches
+                if match and 0 < int(match.group(1)) <= self.total_results
+            ]
+            total = len(indexes)
+        else:
+            stop = min(start + max_results, self.total_results)
+            indexes = range(start + 1, stop + 1)
+            total = self.total_results
+
+        query = escape(query)
+        parts = [FEED_HEADER.format(query=query, total=total, start=start, count=len(indexes))]
+        for index in indexes:
+            parts.append(ENTRY_TEMPLATE.format(
+                arxiv_id=self.paper_id(index), index=index, day=index % 28 + 1, query=query
+            ))
+        parts.append("</feed>\n")
+        return "".join(parts).encode("utf-8")
+
+    def _next_request(self) -> tuple:
+        """Numbers the incoming request; returns (status, extra delay)."""
+        with self._lock:
+            self._received += 1
+            number = self._received
+        failing = self.fail_every and number % self.fail_every == 0
+        slow = self.slow_every and number % self.slow_every == 0
+        return (self.fail_status if failing else 200), (self.slow_latency if slow else 0.0)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, delay = server._next_request()
+                if server.latency or delay:
+                    time.sleep(server.latency + delay)
+
+                with server._lock:
+                    server.requests.append((self.path, status))
+
+                if status != 200:
+                    self.send_response(status)
+                    if server.retry_after is not None:
+                        self.send_header("Retry-After", str(server.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                params = parse_qs(urlparse(self.path).query)
+                query = params.get("search_query", [""])[0].removeprefix("all:")
+                start = int(params.get("start", ["0"])[0])
+                max_results = int(params.get("max_results", ["10"])[0])
+                id_list = [i for i in params.get("id_list", [""])[0].split(",") if i]
+
+                body = server.render_feed(query, start, max_results, id_list)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep test output quiet
+
+        return Handler
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with FakeArxivServer(port=port) as fake:
+        print(f"Fake arXiv API listening on {fake.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
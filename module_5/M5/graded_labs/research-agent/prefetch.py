@@ -0,0 +1,209 @@
+# --- Standard library ---
+import logging
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# --- Local / project ---
+from research_tools import arxiv_search_tool, tavily_search_tool
+from tool_cache import get_default_cache, is_error_result, normalize_query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_QUERIES = 6
+DEFAULT_MAX_RESULTS = 5
+MAX_QUERY_WORDS = 8
+
+# Plan steps that look like information gathering (drafting/editing steps are skipped)
+_SEARCH_STEP_RE = re.compile(
+    r"\b(search|find|look\s+up|research|gather|collect|investigate|identify|explore|survey|retrieve|review)\b",
+    re.IGNORECASE,
+)
+# Topic usually follows one of these ("... papers on <topic>")
+_TOPIC_MARKER_RE = re.compile(r"\b(?:on|about|regarding|related\s+to|concerning|into|for)\s+(.+)$", re.IGNORECASE)
+_WEB_HINT_RE = re.compile(r"\b(web|news|online|tavily|blog|latest|current|industry)\b", re.IGNORECASE)
+_FILLER = frozenset(
+    "a an the and or of in on for to with about recent latest new current relevant key academic scholarly "
+    "papers paper articles article sources source information research studies study web news online arxiv "
+    "tavily wikipedia using use search find gather collect".split()
+)
+_WORD_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9\-]*")
+
+
+def query_from_step(step: str) -> str:
+    """
+    Best-guess search query for one plan step, e.g.
+    "Search arXiv for recent papers on quantum error correction."
+    -> "quantum error correction". Returns "" for non-search steps.
+    """
+    if not _SEARCH_STEP_RE.search(step):
+        return ""
+    match = _TOPIC_MARKER_RE.search(step.strip().rstrip("."))
+    text = match.group(1) if match else step
+    words = [w for w in _WORD_RE.findall(text) if w.lower() not in _FILLER]
+    return " ".join(words[:MAX_QUERY_WORDS])
+
+
+def keywords_from_results(results: list[dict], count: int = 4) -> list[str]:
+    """Most frequent informative title words across earlier tool results."""
+    counter = Counter()
+    for item in results or []:
+        if isinstance(item, dict) and "error" not in item:
+            title_words = {w.lower() for w in _WORD_RE.findall(item.get("title", ""))}
+            counter.update(w for w in title_words if len(w) > 3 and w not in _FILLER)
+    return [word for word, seen in counter.most_common(count) if seen > 1]
+
+
+class Prefetcher:
+    """
+    Speculatively runs likely next research queries in the background while
+    the LLM is thinking, so the agent's real tool calls hit the response cache.
+
+    Queries are guessed from the current plan steps (arXiv by default, Tavily
+    for steps that mention the web or news) plus one keyword query built from
+    earlier results. Calling `update_plan` with a different plan cancels
+    prefetches that have not started yet.
+
+    The default tools are the cached search functions underneath the
+    `instrumented_tool` wrappers, so prefetches warm the cache without
+    showing up in the agent's tool metrics.
+
+    Args:
+        max_workers (int): Maximum concurrent prefetch requests.
+        max_queries (int): Maximum queries scheduled per plan.
+        max_results (int): `max_results` the agent's tool calls use; it is part
+            of the cache key, so prefetches only help when it matches.
+        tools (dict): "arxiv" / "tavily" -> tool function, for overriding.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queries: int = DEFAULT_MAX_QUERIES,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        tools: dict = None,
+    ):
+        self.max_queries = max_queries
+        self.max_results = max_results
+        self.tools = tools or {
+            "arxiv": arxiv_search_tool.__wrapped__,
+            "tavily": tavily_search_tool.__wrapped__,
+        }
+        self.stats = {"scheduled": 0, "completed": 0, "cancelled": 0, "failed": 0}
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.RLock()  # done-callbacks may run inline while it is held
+        self._plan = None
+        self._generation = 0
+        self._futures = {}  # future -> (tool, normalized query)
+        self._done = set()  # (tool, normalized query) prefetched or in progress
+
+    def plan_queries(self, steps: list[str], previous_results: list[dict] = None) -> list[tuple]:
+        """(tool key, query) pairs that `update_plan` would schedule."""
+        planned = []
+        for step in steps:
+            query = query_from_step(step)
+            if query:
+                tool = "tavily" if _WEB_HINT_RE.search(step) else "arxiv"
+                planned.append((tool, query))
+
+        keywords = keywords_from_results(previous_results)
+        if keywords:
+            planned.append(("arxiv", " ".join(keywords)))
+
+        unique, seen = [], set()
+        for tool, query in planned:
+            key = (tool, normalize_query(query))
+            if tool in self.tools and key not in seen:
+                seen.add(key)
+                unique.append((tool, query))
+        return unique[:self.max_queries]
+
+    def update_plan(self, steps: list[str], previous_results: list[dict] = None) -> list[tuple]:
+        """
+        Schedules prefetches for a (new) plan. Re-sending the same plan is a
+        no-op; a changed plan cancels pending prefetches of the old one.
+
+        Returns:
+            list[tuple]: The (tool key, query) pairs newly scheduled.
+        """
+        if get_default_cache() is None:
+            return []  # nowhere to keep the results
+
+        queries = self.plan_queries(steps, previous_results)
+        with self._lock:
+            if queries == self._plan:
+                return []
+            self._cancel_pending()
+            self._plan = queries
+            generation = self._generation
+
+            scheduled = []
+            for tool, query in queries:
+                key = (tool, normalize_query(query))
+                if key in self._done:
+                    continue
+                self._done.add(key)
+                future = self._executor.submit(self._run, generation, tool, query)
+                self._futures[future] = key
+                future.add_done_callback(self._forget)
+                scheduled.append((tool, query))
+            self.stats["scheduled"] += len(scheduled)
+
+        if scheduled:
+            logger.info("prefetching %d queries: %s", len(scheduled), scheduled)
+        return scheduled
+
+    def _run(self, generation: int, tool: str, query: str) -> None:
+        key = (tool, normalize_query(query))
+        if generation != self._generation:
+            with self._lock:
+                self.stats["cancelled"] += 1
+                self._done.discard(key)
+            return
+        try:
+            result = self.tools[tool](query, max_results=self.max_results)
+        except Exception as e:
+            result = [{"error": str(e)}]
+        with self._lock:
+            if is_error_result(result):
+                self.stats["failed"] += 1
+                self._done.discard(key)  # allow a later retry
+            else:
+                self.stats["completed"] += 1
+
+    def _forget(self, future) -> None:
+        with self._lock:
+            self._futures.pop(future, None)
+
+    def _cancel_pending(self) -> None:
+        """Drops queued prefetches (requests already in flight finish into the cache)."""
+        self._generation += 1
+        for future, key in list(self._futures.items()):
+            if future.cancel():
+                self.stats["cancelled"] += 1
+                self._done.discard(key)
+
+    def cancel(self) -> None:
+        """Cancels every prefetch that has not started yet."""
+        with self._lock:
+            self._cancel_pending()
+            self._plan = None
+
+    def wait(self, timeout: float = None) -> None:
+        """Blocks until scheduled prefetches finish (mainly for tests and benchmarks)."""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+
+    def close(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "Prefetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
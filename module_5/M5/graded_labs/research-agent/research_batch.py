@@ -0,0 +1,139 @@
+# --- Standard library ---
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Local / project ---
+from research_tools import (
+    arxiv_id_from_url,
+    arxiv_papers_by_ids,
+    arxiv_search_tool,
+    tavily_search_tool,
+    wikipedia_search_tool,
+)
+from tool_cache import get_default_cache, is_error_result, make_cache_key, normalize_query
+
+DEFAULT_MAX_WORKERS = 4
+ARXIV_ID_LIST_CHUNK = 100  # ids per id_list request
+
+# New-style (2401.01234, optional version) and old-style (hep-th/9901001) ids
+_ARXIV_ID_QUERY_RE = re.compile(r"^(?:\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?$")
+
+
+def _copy_result(result: list) -> list:
+    """Per-input copy so callers can mutate one answer without touching another."""
+    return [dict(item) for item in result]
+
+
+def _run_batch(tool, queries: list[str], max_workers: int, **kwargs) -> list[list[dict]]:
+    """
+    Runs `tool` once per distinct (normalized) query with bounded concurrency
+    and maps the answers back onto every input position.
+    """
+    unique = {}
+    for query in queries:
+        unique.setdefault(normalize_query(query), query)
+
+    def call(query):
+        try:
+            return tool(query, **kwargs)
+        except Exception as e:
+            return [{"error": str(e)}]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique) or 1))) as executor:
+        answers = dict(zip(unique, executor.map(call, unique.values())))
+
+    return [_copy_result(answers[normalize_query(query)]) for query in queries]
+
+
+def _lookup_arxiv_ids(arxiv_ids: list[str]) -> dict:
+    """
+    Resolves arXiv ids with as few `id_list` requests as possible, serving
+    ids already seen from the response cache. Returns {id: result list}.
+    """
+    cache = get_default_cache()
+    found = {}
+    missing = []
+    for arxiv_id in arxiv_ids:
+        cached = cache.get(make_cache_key("arxiv_id_lookup", arxiv_id)) if cache else None
+        if cached is not None:
+            found[arxiv_id] = cached
+        else:
+            missing.append(arxiv_id)
+
+    for i in range(0, len(missing), ARXIV_ID_LIST_CHUNK):
+        chunk = missing[i:i + ARXIV_ID_LIST_CHUNK]
+        response = arxiv_papers_by_ids(",".join(chunk))
+        if is_error_result(response):
+            for arxiv_id in chunk:
+                found[arxiv_id] = _copy_result(response)
+            continue
+        papers = {arxiv_id_from_url(paper["url"]): paper for paper in response}
+
+        for arxiv_id in chunk:
+            paper = papers.get(re.sub(r"v\d+$", "", arxiv_id))
+            if paper is None:
+                found[arxiv_id] = [{"error": f"arXiv id not found: {arxiv_id}"}]
+                continue
+            found[arxiv_id] = [paper]
+            if cache:
+                cache.set(make_cache_key("arxiv_id_lookup", arxiv_id), "arxiv_id_lookup", [paper])
+
+    return found
+
+
+def arxiv_search_batch(
+    queries: list[str], max_results: int = 5, max_workers: int = 2
+) -> list[list[dict]]:
+    """
+    Runs many arXiv searches at once.
+
+    Queries that are bare arXiv identifiers (e.g. "2401.01234") are merged
+    into `id_list` requests; the remaining keyword queries are de-duplicated
+    and run concurrently through `arxiv_search_tool` (so the response cache
+    applies). Keep `max_workers` low: arXiv asks clients to be gentle.
+
+    Args:
+        queries (list[str]): Search strings and/or arXiv ids.
+        max_results (int): Maximum results per keyword query.
+        max_workers (int): Maximum concurrent arXiv requests.
+
+    Returns:
+        list[list[dict]]: One result list per input query, in input order.
+    """
+    id_queries = {q.strip() for q in queries if _ARXIV_ID_QUERY_RE.match(q.strip())}
+    keyword_queries = [q for q in queries if q.strip() not in id_queries]
+
+    by_id = _lookup_arxiv_ids(sorted(id_queries)) if id_queries else {}
+    by_keyword = iter(_run_batch(arxiv_search_tool, keyword_queries, max_workers, max_results=max_results))
+
+    return [
+        _copy_result(by_id[q.strip()]) if q.strip() in id_queries else next(by_keyword)
+        for q in queries
+    ]
+
+
+def tavily_search_batch(
+    queries: list[str],
+    max_results: int = 5,
+    include_images: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[list[dict]]:
+    """
+    Runs many Tavily searches at once, de-duplicated and with bounded
+    concurrency. Returns one result list per input query, in input order.
+    """
+    return _run_batch(
+        tavily_search_tool, queries, max_workers,
+        max_results=max_results, include_images=include_images
+    )
+
+
+def wikipedia_search_batch(
+    queries: list[str], sentences: int = 5, max_workers: int = DEFAULT_MAX_WORKERS
+) -> list[list[dict]]:
+    """
+    Runs many Wikipedia lookups at once, de-duplicated and with bounded
+    concurrency. Returns one result list per input query, in input order.
+    """
+    return _run_batch(wikipedia_search_tool, queries, max_workers, sentences=sentences)
+
@@ -1,116 +1,284 @@
 # --- Standard library ---
 import os
+import re
+import threading
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 
 # --- Third-party ---
 import requests
 from dotenv import load_dotenv
 from tavily import TavilyClient
-import wikipedia
+
+# --- Local / project ---
+from arxiv_index import get_arxiv_index
+from resilience import ResilientSession
+from tool_cache import cached_tool, normalize_query
+from tool_metrics import instrumented_tool
+from tool_registry import ToolRegistry
+from tool_replay import replayable_tool
 
 # Init env
 load_dotenv()  # load variables 
 
 # Set user-agent for requests to arXiv
+USER_AGENT = "LF-ADP-Agent/1.0 (mailto:your.email@example.com)"
 session = requests.Session()
 session.headers.update({
-    "User-Agent": "LF-ADP-Agent/1.0 (mailto:your.email@example.com)"
+    "User-Agent": USER_AGENT
 })
 
-def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
+
+def _hedge_setting(value: str):
+    """RESEARCH_TOOLS_HEDGE: unset/"0" = off, "p95" = adaptive, or a delay in seconds."""
+    if not value or value == "0":
+        return False
+    return True if value.lower() == "p95" else float(value)
+
+
+# Retries, per-host circuit breaker and optional hedging around `session`
+resilient_session = ResilientSession(session, hedge=_hedge_setting(os.getenv("RESEARCH_TOOLS_HEDGE", "")))
+
+ARXIV_API_URL = os.getenv("ARXIV_API_URL", "https://export.arxiv.org/api/query")
+ARXIV_TIMEOUT = 60          # overall budget for one arXiv call, retries included
+ARXIV_ATTEMPT_TIMEOUT = 20  # per attempt, so one slow mirror cannot use up the budget
+ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+OPENSEARCH_NS = 'http://a9.com/-/spec/opensearch/1.1/'
+
+_ARXIV_ID_RE = re.compile(r'arxiv\.org/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?/?$', re.IGNORECASE)
+
+
+def arxiv_id_from_url(url: str) -> str | None:
     """
-    Searches arXiv for research papers matching the given query.
+    Extracts the version-less arXiv identifier from an abstract or PDF URL,
+    e.g. "http://arxiv.org/abs/2401.01234v2" -> "2401.01234".
+    Returns None for non-arXiv URLs.
     """
-    url = f"https://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results={max_results}"
+    match = _ARXIV_ID_RE.search(url or "")
+    return match.group(1) if match else None
 
-    try:
-        response = session.get(url, timeout=60)
+
+def _arxiv_params(query: str, max_results: int, start: int = 0) -> dict:
+    """Query-string parameters for an arXiv API search."""
+    return {
+        "search_query": f"all:{query}",
+        "start": start,
+        "max_results": max_results
+    }
+
+
+def _parse_arxiv_entry(entry) -> dict:
+    """Extracts the result dict from a single Atom <entry> element."""
+    ns = ATOM_NS
+    title = entry.find('atom:title', ns).text.strip()
+    authors = [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns)]
+    published = entry.find('atom:published', ns).text[:10]
+    url_abstract = entry.find('atom:id', ns).text
+    summary = entry.find('atom:summary', ns).text.strip()
+
+    link_pdf = None
+    for link in entry.findall('atom:link', ns):
+        if link.attrib.get('title') == 'pdf':
+            link_pdf = link.attrib.get('href')
+            break
+
+    return {
+        "title": title,
+        "authors": authors,
+        "published": published,
+        "url": url_abstract,
+        "summary": summary,
+        "link_pdf": link_pdf
+    }
+
+
+class _AtomEntryStream:
+    """
+    Incremental Atom parser: feed it bytes as they arrive and it returns the
+    result dicts of every <entry> completed so far, discarding parsed
+    elements so memory stays flat regardless of feed size.
+    """
+
+    ENTRY_TAG = f"{{{ATOM_NS['atom']}}}entry"
+    TOTAL_RESULTS_TAG = f"{{{OPENSEARCH_NS}}}totalResults"
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self.total_results = None  # from <opensearch:totalResults>, once seen
+
+    def feed(self, chunk: bytes) -> list[dict]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> list[dict]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[dict]:
+        results = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+            elif elem.tag == self.ENTRY_TAG:
+                results.append(_parse_arxiv_entry(elem))
+                self._root.clear()
+            elif elem.tag == self.TOTAL_RESULTS_TAG and elem.text:
+                self.total_results = int(elem.text)
+        return results
+
+
+def _stream_arxiv(params: dict, chunk_size: int = 16384):
+    """Sends one arXiv API request and yields result dicts as entries arrive."""
+    with resilient_session.get(
+        ARXIV_API_URL, params=params, timeout=ARXIV_ATTEMPT_TIMEOUT, total_timeout=ARXIV_TIMEOUT, stream=True
+    ) as response:
         response.raise_for_status()
+        parser = _AtomEntryStream()
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            yield from parser.feed(chunk)
+        yield from parser.close()
+
+
+def iter_arxiv_results(query: str, max_results: int = 5, start: int = 0, chunk_size: int = 16384):
+    """
+    Streams arXiv search results, yielding each paper's dict as soon as its
+    <entry> has been downloaded and parsed.
+
+    Args:
+        query (str): Search keywords.
+        max_results (int): Maximum number of results to request.
+        start (int): Offset of the first result.
+        chunk_size (int): Bytes read from the socket per step.
+
+    Yields:
+        dict: The same result dicts returned by `arxiv_search_tool`.
+
+    Raises:
+        requests.exceptions.RequestException: On HTTP/network failure.
+        xml.etree.ElementTree.ParseError: On a malformed feed.
+    """
+    yield from _stream_arxiv(_arxiv_params(query, max_results, start), chunk_size)
+
+
+def iter_arxiv_by_ids(arxiv_ids: list[str], chunk_size: int = 16384):
+    """
+    Fetches several papers by identifier in one request (arXiv's `id_list`),
+    yielding result dicts in the order arXiv returns them.
+    """
+    params = {"id_list": ",".join(arxiv_ids), "max_results": len(arxiv_ids)}
+    yield from _stream_arxiv(params, chunk_size)
+
+
+@replayable_tool("arxiv_id_list")
+def arxiv_papers_by_ids(query: str) -> list[dict]:
+    """
+    Papers for a comma-separated list of arXiv ids (`query`), fetched with one
+    `id_list` request. Recorded and replayed like the search tools.
+    """
+    try:
+        return list(iter_arxiv_by_ids(query.split(",")))
     except requests.exceptions.RequestException as e:
         return [{"error": str(e)}]
+    except Exception as e:
+        return [{"error": f"Parsing failed: {str(e)}"}]
 
-    try:
-        root = ET.fromstring(response.content)
-        ns = {'atom': 'http://www.w3.org/2005/Atom'}
 
-        results = []
-        for entry in root.findall('atom:entry', ns):
-            title = entry.find('atom:title', ns).text.strip()
-            authors = [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns)]
-            published = entry.find('atom:published', ns).text[:10]
-            url_abstract = entry.find('atom:id', ns).text
-            summary = entry.find('atom:summary', ns).text.strip()
-
-            link_pdf = None
-            for link in entry.findall('atom:link', ns):
-                if link.attrib.get('title') == 'pdf':
-                    link_pdf = link.attrib.get('href')
-                    break
-
-            results.append({
-                "title": title,
-                "authors": authors,
-                "published": published,
-                "url": url_abstract,
-                "summary": summary,
-                "link_pdf": link_pdf
-            })
+@instrumented_tool("arxiv_search_tool")
+@replayable_tool("arxiv_search_tool")
+@cached_tool("arxiv_search_tool")
+def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
+    """
+    Searches arXiv for research papers matching the given query.
 
+    Args:
+        query (str): Search keywords for research papers.
+        max_results (int): Maximum number of results to return.
+    """
+    index = get_arxiv_index()
+    if index is not None:
+        local = index.search(query, max_results)
+        if local is not None:
+            return local
+
+    try:
+        results = list(iter_arxiv_results(query, max_results))
+        if index is not None:
+            index.add(results)
         return results
+    except requests.exceptions.RequestException as e:
+        return [{"error": str(e)}]
     except Exception as e:
         return [{"error": f"Parsing failed: {str(e)}"}]
 
 
-arxiv_tool_def = {
-    "type": "function",
-    "function": {
-        "name": "arxiv_search_tool",
-        "description": "Searches for research papers on arXiv by query string.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search keywords for research papers."
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "Maximum number of results to return.",
-                    "default": 5
-                }
-            },
-            "required": ["query"]
-        }
-    }
-}
+def _tavily_settings() -> tuple:
+    """
+    Reads (api_key, api_base_url) for Tavily from the environment.
+    """
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        raise ValueError("TAVILY_API_KEY not found in environment variables.")
+    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
+    return api_key, api_base_url
+
 
+# Shared Tavily client: created lazily and reused so calls keep the client's
+# pooled keep-alive connections instead of paying setup + TLS every time.
+_tavily_client = None
+_tavily_client_settings = None
+_tavily_client_lock = threading.Lock()
 
 
+def get_tavily_client() -> TavilyClient:
+    """
+    Returns the shared TavilyClient, rebuilding it only when TAVILY_API_KEY or
+    DLAI_TAVILY_BASE_URL have changed since it was created.
+    """
+    global _tavily_client, _tavily_client_settings
+    settings = _tavily_settings()
+    with _tavily_client_lock:
+        if _tavily_client is None or settings != _tavily_client_settings:
+            api_key, api_base_url = settings
+            _tavily_client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
+            _tavily_client_settings = settings
+        return _tavily_client
+
+
+def _format_tavily_response(response: dict, include_images: bool) -> list[dict]:
+    """Reduces a raw Tavily response to the tool's result dicts."""
+    results = []
+    for r in response.get("results", []):
+        results.append({
+            "title": r.get("title", ""),
+            "content": r.get("content", ""),
+            "url": r.get("url", "")
+        })
+
+    if include_images:
+        for img_url in response.get("images", []):
+            results.append({"image_url": img_url})
+
+    return results
+
+
+@instrumented_tool("tavily_search_tool")
+@replayable_tool("tavily_search_tool")
+@cached_tool("tavily_search_tool")
 def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict]:
     """
-    Perform a search using the Tavily API.
+    Performs a general-purpose web search using the Tavily API.
 
     Args:
-        query (str): The search query.
-        max_results (int): Number of results to return (default 5).
+        query (str): Search keywords for retrieving information from the web.
+        max_results (int): Maximum number of results to return.
         include_images (bool): Whether to include image results.
 
     Returns:
         list[dict]: A list of dictionaries with keys like 'title', 'content', and 'url'.
     """
-    params = {}
-    api_key = os.getenv("TAVILY_API_KEY")
-    if not api_key:
-        raise ValueError("TAVILY_API_KEY not found in environment variables.")
-    params['api_key'] = api_key
-
-    #client = TavilyClient(api_key)
-
-    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
-    if api_base_url:
-        params['api_base_url'] = api_base_url
-
-    client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
+    client = get_tavily_client()
 
     try:
         response = client.search(
@@ -118,108 +286,136 @@ def tavily_search_tool(query: str, max_results: int = 5, include_images: bool =
             max_results=max_results,
             include_images=include_images
         )
-
-        results = []
-        for r in response.get("results", []):
-            results.append({
-                "title": r.get("title", ""),
-                "content": r.get("content", ""),
-                "url": r.get("url", "")
-            })
-
-        if include_images:
-            for img_url in response.get("images", []):
-                results.append({"image_url": img_url})
-
-        return results
+        return _format_tavily_response(response, include_images)
 
     except Exception as e:
         return [{"error": str(e)}]  # For LLM-friendly agents
     
 
-tavily_tool_def = {
-    "type": "function",
-    "function": {
-        "name": "tavily_search_tool",
-        "description": "Performs a general-purpose web search using the Tavily API.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search keywords for retrieving information from the web."
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "Maximum number of results to return.",
-                    "default": 5
-                },
-                "include_images": {
-                    "type": "boolean",
-                    "description": "Whether to include image results.",
-                    "default": False
-                }
-            },
-            "required": ["query"]
-        }
-    }
-}
 
 ## Wikipedia search tool
 
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+WIKIPEDIA_TIMEOUT = 30
+WIKIPEDIA_CANDIDATES = 5  # search hits fetched so disambiguation pages can be skipped
+WIKIPEDIA_TITLE_CACHE_SIZE = 1024
+
+# normalized query -> resolved article title (skips search + disambiguation next time)
+_wikipedia_titles = OrderedDict()
+_wikipedia_titles_lock = threading.Lock()
+
+
+def _wikipedia_params(query: str, sentences: int) -> dict:
+    """
+    MediaWiki API parameters that resolve the article, its plain-text intro
+    truncated to `sentences` and its URL in a single request.
+    """
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "redirects": 1,
+        "prop": "extracts|info|pageprops",
+        "exintro": 1,
+        "explaintext": 1,
+        "exsentences": sentences,
+        "exlimit": WIKIPEDIA_CANDIDATES,
+        "inprop": "url",
+        "ppprop": "disambiguation",
+    }
+
+    with _wikipedia_titles_lock:
+        title = _wikipedia_titles.get(normalize_query(query))
+
+    if title:
+        params["titles"] = title
+    else:
+        params.update({
+            "generator": "search",
+            "gsrsearch": query,
+            "gsrlimit": WIKIPEDIA_CANDIDATES,
+        })
+    return params
+
+
+def _parse_wikipedia_response(query: str, data: dict) -> list[dict]:
+    """
+    Picks the best-ranked non-disambiguation page from a MediaWiki API
+    response and remembers it for `query`. Raises if nothing was found.
+    """
+    pages = [
+        page for page in data.get("query", {}).get("pages", [])
+        if not page.get("missing") and not page.get("invalid")
+    ]
+    if not pages:
+        with _wikipedia_titles_lock:
+            _wikipedia_titles.pop(normalize_query(query), None)  # stale resolution
+        raise ValueError(f"No Wikipedia article found for '{query}'.")
+
+    pages.sort(key=lambda page: page.get("index", 0))
+    articles = [page for page in pages if "disambiguation" not in page.get("pageprops", {})]
+    page = (articles or pages)[0]
+
+    with _wikipedia_titles_lock:
+        key = normalize_query(query)
+        _wikipedia_titles[key] = page["title"]
+        _wikipedia_titles.move_to_end(key)
+        while len(_wikipedia_titles) > WIKIPEDIA_TITLE_CACHE_SIZE:
+            _wikipedia_titles.popitem(last=False)
+
+    return [{
+        "title": page["title"],
+        "summary": page.get("extract", "").strip(),
+        "url": page["fullurl"]
+    }]
+
+
+def _wikipedia_lookup(query: str, sentences: int) -> list[dict]:
+    """
+    Resolves the best-matching article and returns its title, summary and URL
+    with one API request. Raises on lookup failure.
+    """
+    response = resilient_session.get(
+        WIKIPEDIA_API_URL, params=_wikipedia_params(query, sentences), timeout=WIKIPEDIA_TIMEOUT
+    )
+    response.raise_for_status()
+    return _parse_wikipedia_response(query, response.json())
+
+
+@instrumented_tool("wikipedia_search_tool")
+@replayable_tool("wikipedia_search_tool")
+@cached_tool("wikipedia_search_tool")
 def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
     """
     Searches Wikipedia for a summary of the given query.
 
     Args:
-        query (str): Search query for Wikipedia.
-        sentences (int): Number of sentences to include in the summary.
+        query (str): Search keywords for the Wikipedia article.
+        sentences (int): Number of sentences in the summary.
 
     Returns:
         list[dict]: A list with a single dictionary containing title, summary, and URL.
     """
     try:
-        page_title = wikipedia.search(query)[0]
-        page = wikipedia.page(page_title)
-        summary = wikipedia.summary(page_title, sentences=sentences)
-
-        return [{
-            "title": page.title,
-            "summary": summary,
-            "url": page.url
-        }]
+        return _wikipedia_lookup(query, sentences)
     except Exception as e:
         return [{"error": str(e)}]
 
-# Tool definition
-wikipedia_tool_def = {
-    "type": "function",
-    "function": {
-        "name": "wikipedia_search_tool",
-        "description": "Searches for a Wikipedia article summary by query string.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search keywords for the Wikipedia article."
-                },
-                "sentences": {
-                    "type": "integer",
-                    "description": "Number of sentences in the summary.",
-                    "default": 5
-                }
-            },
-            "required": ["query"]
-        }
-    }
-}
 
+# Tool definitions and mapping, generated once from the functions' signatures and docstrings
+tool_registry = ToolRegistry([tavily_search_tool, arxiv_search_tool, wikipedia_search_tool])
+arxiv_tool_def = tool_registry.definition("arxiv_search_tool")
+tavily_tool_def = tool_registry.definition("tavily_search_tool")
+wikipedia_tool_def = tool_registry.definition("wikipedia_search_tool")
+tool_mapping = tool_registry.mapping
 
 
-# Tool mapping
-tool_mapping = {
-    "tavily_search_tool": tavily_search_tool,
-    "arxiv_search_tool": arxiv_search_tool,
-    "wikipedia_search_tool": wikipedia_search_tool
-}
\ No newline at end of file
+def register_tool(func) -> None:
+    """
+    Offers a tool defined in another module (arxiv_pdf, semantic_search) to
+    the research agent, next to the search tools above. Those modules build
+    on this one, so they register themselves when imported.
+    """
+    global tool_mapping
+    tool_registry.register(func)
+    tool_mapping = tool_registry.mapping
@@ -0,0 +1,260 @@
+# --- Standard library ---
+import asyncio
+import time
+import weakref
+from urllib.parse import urlsplit
+
+# --- Third-party ---
+import httpx
+from tavily import AsyncTavilyClient
+
+# --- Local / project ---
+from arxiv_index import get_arxiv_index
+from research_tools import (
+    ARXIV_API_URL,
+    ARXIV_ATTEMPT_TIMEOUT,
+    ARXIV_TIMEOUT,
+    USER_AGENT,
+    WIKIPEDIA_API_URL,
+    WIKIPEDIA_TIMEOUT,
+    _arxiv_params,
+    _AtomEntryStream,
+    _format_tavily_response,
+    _parse_wikipedia_response,
+    _tavily_settings,
+    _wikipedia_params,
+    resilient_session,
+)
+from resilience import RETRY_STATUSES, CircuitOpenError, _clip_timeout
+from tool_cache import cached_tool
+from tool_metrics import instrumented_tool
+from tool_replay import replayable_tool
+
+# Connection pool limits for the shared async HTTP client
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+# httpx connections are bound to the event loop that opened them, so keep
+# one pooled client per running loop.
+_clients = weakref.WeakKeyDictionary()
+# loop -> (Tavily settings, AsyncTavilyClient). Tavily gets its own client:
+# it sets its bearer token on the httpx client it is given.
+_tavily_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled, keep-alive async HTTP client for the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=ARXIV_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def get_async_tavily_client() -> AsyncTavilyClient:
+    """
+    Returns the shared AsyncTavilyClient for the running event loop, rebuilding
+    it only when TAVILY_API_KEY or DLAI_TAVILY_BASE_URL have changed.
+    """
+    loop = asyncio.get_running_loop()
+    settings = _tavily_settings()
+    cached = _tavily_clients.get(loop)
+    if cached is not None and cached[0] == settings:
+        return cached[1]
+    if cached is not None:
+        await cached[1].close()
+    api_key, api_base_url = settings
+    client = AsyncTavilyClient(api_key=api_key, api_base_url=api_base_url)
+    _tavily_clients[loop] = (settings, client)
+    return client
+
+
+async def aclose_clients() -> None:
+    """Closes the shared HTTP and Tavily clients of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+    cached = _tavily_clients.pop(loop, None)
+    if cached is not None:
+        await cached[1].close()
+
+
+async def resilient_get(url: str, timeout: float, total_timeout: float = None, **kwargs) -> httpx.Response:
+    """
+    Async counterpart of `research_tools.resilient_session.get`: the same
+    per-host circuit breakers, retry policy (jittered backoff, Retry-After)
+    and stats, on the shared httpx client. Hedging is not applied here;
+    concurrent async calls already overlap their waits.
+
+    `timeout` applies per attempt and is clipped to what is left of
+    `total_timeout`. Extra keyword arguments go to `httpx.AsyncClient.send`
+    (`stream`) or `build_request` (`params`, `headers`, ...). A streamed
+    response must be closed by the caller.
+
+    Raises:
+        CircuitOpenError: The host's circuit is open.
+        httpx.TimeoutException: `total_timeout` ran out before an attempt.
+        httpx.TransportError: The last network error once retries are exhausted.
+    """
+    policy = resilient_session
+    stream = kwargs.pop("stream", False)
+    host = urlsplit(url).netloc
+    breaker = policy.breaker(host)
+    client = get_async_client()
+    deadline = time.monotonic() + total_timeout if total_timeout else None
+
+    for attempt in range(policy.max_retries + 1):
+        attempt_timeout = timeout
+        if deadline:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise httpx.TimeoutException(f"total timeout of {total_timeout}s exceeded for {host}")
+            attempt_timeout = _clip_timeout(timeout, remaining)
+
+        if not breaker.allow():
+            policy.stats["short_circuits"] += 1
+            raise CircuitOpenError(f"circuit open for {host}; not sending request")
+
+        policy.stats["requests"] += 1
+        last = attempt == policy.max_retries
+        try:
+            request = client.build_request("GET", url, timeout=attempt_timeout, **kwargs)
+            response = await client.send(request, stream=stream)
+        except httpx.TransportError:
+            breaker.record_failure()
+            wait_for = policy._retry_delay(attempt)
+            if last or (deadline and time.monotonic() + wait_for >= deadline):
+                raise
+        except BaseException:
+            # Includes cancellation: the half-open trial must be released.
+            breaker.record_failure()
+            raise
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            wait_for = policy._retry_delay(attempt, response)
+            if last or (deadline and time.monotonic() + wait_for >= deadline):
+                return response
+            await response.aclose()
+
+        policy.stats["retries"] += 1
+        await asyncio.sleep(wait_for)
+
+
+async def aiter_arxiv_results(query: str, max_results: int = 5, start: int = 0):
+    """
+    Async generator counterpart of `research_tools.iter_arxiv_results`:
+    yields each paper's dict as soon as its <entry> has been received.
+    """
+    response = await resilient_get(
+        ARXIV_API_URL, params=_arxiv_params(query, max_results, start),
+        timeout=ARXIV_ATTEMPT_TIMEOUT, total_timeout=ARXIV_TIMEOUT, stream=True,
+    )
+    try:
+        response.raise_for_status()
+        parser = _AtomEntryStream()
+        async for chunk in response.aiter_bytes():
+            for result in parser.feed(chunk):
+                yield result
+        for result in parser.close():
+            yield result
+    finally:
+        await response.aclose()
+
+
+@instrumented_tool("arxiv_search_tool")
+@replayable_tool("arxiv_search_tool")
+@cached_tool("arxiv_search_tool")
+async def arxiv_search_tool_async(query: str, max_results: int = 5) -> list[dict]:
+    """
+    Searches arXiv for research papers matching the given query.
+    """
+    index = get_arxiv_index()  # local SQLite lookups take milliseconds, fine inline
+    if index is not None:
+        local = index.search(query, max_results)
+        if local is not None:
+            return local
+
+    try:
+        results = [result async for result in aiter_arxiv_results(query, max_results)]
+        if index is not None:
+            index.add(results)
+        return results
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        return [{"error": str(e)}]
+    except Exception as e:
+        return [{"error": f"Parsing failed: {str(e)}"}]
+
+
+@instrumented_tool("tavily_search_tool")
+@replayable_tool("tavily_search_tool")
+@cached_tool("tavily_search_tool")
+async def tavily_search_tool_async(query: str, max_results: int = 5, include_images: bool = False) -> list[dict]:
+    """
+    Perform a search using the Tavily API.
+
+    Args:
+        query (str): The search query.
+        max_results (int): Number of results to return (default 5).
+        include_images (bool): Whether to include image results.
+
+    Returns:
+        list[dict]: A list of dictionaries with keys like 'title', 'content', and 'url'.
+    """
+    client = await get_async_tavily_client()
+
+    try:
+        response = await client.search(
+            query=query,
+            max_results=max_results,
+            include_images=include_images
+        )
+        return _format_tavily_response(response, include_images)
+
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+@instrumented_tool("wikipedia_search_tool")
+@replayable_tool("wikipedia_search_tool")
+@cached_tool("wikipedia_search_tool")
+async def wikipedia_search_tool_async(query: str, sentences: int = 5) -> list[dict]:
+    """
+    Searches Wikipedia for a summary of the given query.
+
+    Args:
+        query (str): Search query for Wikipedia.
+        sentences (int): Number of sentences to include in the summary.
+
+    Returns:
+        list[dict]: A list with a single dictionary containing title, summary, and URL.
+    """
+    try:
+        response = await resilient_get(
+            WIKIPEDIA_API_URL, params=_wikipedia_params(query, sentences), timeout=WIKIPEDIA_TIMEOUT
+        )
+        response.raise_for_status()
+        return _parse_wikipedia_response(query, response.json())
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+# Tool mapping
+async_tool_mapping = {
+    "tavily_search_tool": tavily_search_tool_async,
+    "arxiv_search_tool": arxiv_search_tool_async,
+    "wikipedia_search_tool": wikipedia_search_tool_async
+}
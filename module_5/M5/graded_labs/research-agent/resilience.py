@@ -0,0 +1,305 @@
+# --- Standard library ---
+import email.utils
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+# --- Third-party ---
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF = 0.5       # seconds before the first retry, doubled each time
+DEFAULT_MAX_BACKOFF = 8.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+LATENCY_WINDOW = 100        # recent latencies kept per host for the hedge threshold
+MIN_HEDGE_SAMPLES = 20      # use the fallback delay until this many are known
+DEFAULT_HEDGE_DELAY = 2.0   # fallback hedge delay (seconds)
+HEDGE_WORKERS = 8
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request while a host's circuit is open.
+    Subclasses ConnectionError so existing `except RequestException`
+    handlers in the tools report it like any other network failure.
+    """
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one backend.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail immediately. Once `reset_timeout` seconds have passed a
+    single trial request is let through (half-open): success closes the
+    circuit again, failure re-opens it for another `reset_timeout`.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds to stay open before a trial request.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("circuit opened after %d consecutive failures", self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+def _retry_after_seconds(response: requests.Response) -> float | None:
+    """Delay requested by a Retry-After header (seconds or HTTP date), if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+def _clip_timeout(timeout, remaining: float):
+    """A `requests` timeout (number or (connect, read) tuple) capped at `remaining` seconds."""
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return min(timeout, remaining)
+
+
+class ResilientSession:
+    """
+    Wraps a `requests.Session` for idempotent GETs with:
+
+    - jittered exponential retries on connection errors, timeouts and
+      429/5xx responses (honouring Retry-After);
+    - a per-host `CircuitBreaker` that fails fast while a backend is down;
+    - optional hedging: if the first attempt has not answered after the
+      host's recent p95 latency (or a fixed delay), an identical second
+      request is sent and whichever answers first is used.
+
+    Args:
+        session (requests.Session): Underlying session (headers, pooling).
+        max_retries (int): Retries after the first attempt.
+        backoff (float): Base delay before the first retry, doubled per retry.
+        max_backoff (float): Upper bound for a single retry delay.
+        failure_threshold (int): Consecutive failures that open a host's circuit.
+        reset_timeout (float): Seconds a circuit stays open before a trial request.
+        hedge (bool | float): False disables hedging, True hedges after the
+            host's p95 latency, a number hedges after that many seconds.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        hedge: bool | float = False,
+    ):
+        self.session = session
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge = hedge
+        self.stats = {"requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "short_circuits": 0}
+
+        self._breakers = {}
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    # --- per-host state ---
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def _record_latency(self, host: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(host, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def hedge_delay(self, host: str) -> float | None:
+        """Seconds to wait before hedging a request to `host`, or None."""
+        if self.hedge is False or self.hedge is None:
+            return None
+        if self.hedge is not True:
+            return float(self.hedge)
+        with self._lock:
+            samples = sorted(self._latencies.get(host, ()))
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        return samples[int(len(samples) * 0.95) - 1]
+
+    # --- sending ---
+
+    def _send(self, url: str, kwargs: dict) -> requests.Response:
+        host = urlsplit(url).netloc
+        start = time.monotonic()
+        response = self.session.get(url, **kwargs)
+        self._record_latency(host, time.monotonic() - start)
+        return response
+
+    def _send_hedged(self, url: str, kwargs: dict, delay: float) -> requests.Response:
+        """Sends the request, plus a duplicate if the first is slower than `delay`."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+            executor = self._executor
+
+        primary = executor.submit(self._send, url, kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self.stats["hedges"] += 1
+        hedged = executor.submit(self._send, url, kwargs)
+        pending = {primary, hedged}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                # Release the loser's connection whenever it finishes.
+                for other in pending:
+                    other.add_done_callback(
+                        lambda f: f.exception() is None and f.result().close()
+                    )
+                if future is hedged:
+                    self.stats["hedge_wins"] += 1
+                return future.result()
+        raise error
+
+    def _retry_delay(self, attempt: int, response: requests.Response = None) -> float:
+        if response is not None:
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        # "Full jitter": uniform in [0, capped exponential backoff]
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get(self, url: str, total_timeout: float = None, **kwargs) -> requests.Response:
+        """
+        Resilient `session.get`. Accepts the usual `requests` keyword
+        arguments (`params`, `timeout`, `stream`, ...); `timeout` applies
+        per attempt, while `total_timeout` (seconds) bounds all attempts and
+        backoff sleeps together: each attempt's `timeout` is clipped to the
+        time left.
+
+        Returns the first successful (non-retryable) response. If retries are
+        exhausted on a retryable status, that last response is returned so
+        the caller's `raise_for_status()` reports it.
+
+        Raises:
+            CircuitOpenError: The host's circuit is open.
+            requests.exceptions.Timeout: `total_timeout` ran out before an attempt.
+            requests.exceptions.RequestException: The last network error once
+                retries are exhausted.
+        """
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        deadline = time.monotonic() + total_timeout if total_timeout else None
+
+        for attempt in range(self.max_retries + 1):
+            attempt_kwargs = kwargs
+            if deadline:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise requests.exceptions.Timeout(f"total timeout of {total_timeout}s exceeded for {host}")
+                attempt_kwargs = {**kwargs, "timeout": _clip_timeout(kwargs.get("timeout"), remaining)}
+
+            if not breaker.allow():
+                self.stats["short_circuits"] += 1
+                raise CircuitOpenError(f"circuit open for {host}; not sending request")
+
+            self.stats["requests"] += 1
+            last = attempt == self.max_retries
+            try:
+                delay = self.hedge_delay(host)
+                if delay is not None:
+                    response = self._send_hedged(url, attempt_kwargs, delay)
+                else:
+                    response = self._send(url, attempt_kwargs)
+            except RETRY_EXCEPTIONS:
+                breaker.record_failure()
+                wait_for = self._retry_delay(attempt)
+                if last or (deadline and time.monotonic() + wait_for >= deadline):
+                    raise
+            except BaseException:
+                # Anything else (TooManyRedirects, InvalidURL, KeyboardInterrupt, ...)
+                # still ends the attempt; without this a half-open trial would
+                # never be released and the circuit would stay stuck.
+                breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    # 4xx other than 429 mean the host is up; it is the request that is wrong.
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                wait_for = self._retry_delay(attempt, response)
+                if last or (deadline and time.monotonic() + wait_for >= deadline):
+                    return response
+                response.close()
+
+            self.stats["retries"] += 1
+            logger.info("retrying %s in %.2fs (attempt %d of %d)", host, wait_for, attempt + 2, self.max_retries + 1)
+            time.sleep(wait_for)
@@ -0,0 +1,143 @@
+# --- Standard library ---
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# --- Local / project ---
+from research_tools import arxiv_id_from_url
+
+# MinHash / LSH settings: 32 hashes in 8 bands of 4 rows finds pairs with
+# Jaccard similarity around 0.7 and above with high probability.
+NUM_HASHES = 32
+BANDS = 8
+ROWS = NUM_HASHES // BANDS
+SHINGLE_SIZE = 4
+DEFAULT_TITLE_THRESHOLD = 0.8
+
+# One 32-bit XOR mask per hash function: min(crc32(shingle) ^ mask) is a
+# cheap MinHash family that keeps signature computation in fast int ops.
+_HASH_MASKS = [zlib.crc32(f"minhash-{i}".encode()) for i in range(NUM_HASHES)]
+
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|ref|ref_src|fbclid|gclid|mc_cid|mc_eid)$", re.IGNORECASE)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalizes a URL so that trivially different links to the same page
+    compare equal. arXiv abstract/PDF links of any version map to "arxiv:<id>".
+    """
+    if not url:
+        return ""
+    arxiv_id = arxiv_id_from_url(url)
+    if arxiv_id:
+        return f"arxiv:{arxiv_id}"
+
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.").removeprefix("m.")
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(k)
+    ))
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def _title_shingles(title: str) -> set:
+    text = _NON_WORD.sub(" ", title.lower()).strip()
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _minhash(shingles: set) -> tuple:
+    hashed = [zlib.crc32(s.encode()) for s in shingles]
+    return tuple(min(h ^ mask for h in hashed) for mask in _HASH_MASKS)
+
+
+def _similarity(sig_a: tuple, sig_b: tuple) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_HASHES
+
+
+def _result_url(item: dict) -> str:
+    return item.get("url") or item.get("image_url") or ""
+
+
+def merge_results(
+    results_by_source: dict[str, list[dict]],
+    title_threshold: float = DEFAULT_TITLE_THRESHOLD,
+) -> list[dict]:
+    """
+    Merges the outputs of several research tools into one de-duplicated list.
+
+    Two results are the same item if they share a canonical URL or arXiv id,
+    or if their titles are near-duplicates (MinHash over character shingles,
+    bucketed with LSH so the whole pass stays linear in the number of results).
+
+    Args:
+        results_by_source (dict): Tool name -> list of result dicts, e.g.
+            {"arxiv_search_tool": [...], "tavily_search_tool": [...]}.
+            Earlier sources win when choosing which copy to keep.
+        title_threshold (float): Minimum estimated title similarity (0-1).
+
+    Returns:
+        list[dict]: One dict per distinct item, in first-seen order. Each is
+        the first copy seen, completed with fields missing from it that later
+        copies had, plus `sources` (tools that returned it) and, when the
+        copies linked to different pages, `alt_urls`. Error entries are passed
+        through with their `sources`.
+    """
+    merged = []         # output records
+    by_key = {}         # canonical url / arxiv id -> index in merged
+    buckets = {}        # (band, band hash) -> indexes in merged
+    signatures = {}     # index in merged -> MinHash signature
+
+    for source, results in results_by_source.items():
+        for item in results or []:
+            if not isinstance(item, dict):
+                continue
+            if "error" in item:
+                merged.append({**item, "sources": [source]})
+                continue
+
+            url = _result_url(item)
+            key = canonical_url(url)
+            shingles = _title_shingles(item.get("title", ""))
+            signature = _minhash(shingles) if shingles else None
+
+            match = by_key.get(key) if key else None
+            if match is None and signature is not None:
+                for band in range(BANDS):
+                    band_key = (band, signature[band * ROWS:(band + 1) * ROWS])
+                    for candidate in buckets.get(band_key, ()):
+                        if _similarity(signature, signatures[candidate]) >= title_threshold:
+                            match = candidate
+                            break
+                    if match is not None:
+                        break
+
+            if match is None:
+                match = len(merged)
+                merged.append({**item, "sources": [source]})
+                if signature is not None:
+                    signatures[match] = signature
+                    for band in range(BANDS):
+                        band_key = (band, signature[band * ROWS:(band + 1) * ROWS])
+                        buckets.setdefault(band_key, []).append(match)
+            else:
+                record = merged[match]
+                for field, value in item.items():
+                    if value and not record.get(field):
+                        record[field] = value
+                if source not in record["sources"]:
+                    record["sources"].append(source)
+                if url and key != canonical_url(_result_url(record)):
+                    alt_urls = record.setdefault("alt_urls", [])
+                    if url not in alt_urls:
+                        alt_urls.append(url)
+
+            if key:
+                by_key.setdefault(key, match)
+
+    return merged
@@ -0,0 +1,228 @@
+# --- Standard library ---
+import json
+import re
+import threading
+import zlib
+
+# --- Third-party ---
+import numpy as np
+
+# --- Local / project ---
+from research_tools import register_tool
+from result_merge import canonical_url
+from tool_cache import get_default_cache, is_error_result
+from tool_metrics import instrumented_tool
+from tool_registry import function_schema
+
+DEFAULT_DIMENSIONS = 1024
+INITIAL_CAPACITY = 256
+# Rows are dense float32: 1024 dims * 4 bytes = 4 KiB per document, so the
+# default cap bounds the matrix at about 80 MB (100k documents would be ~400 MB).
+DEFAULT_MAX_DOCUMENTS = 20000
+TEXT_FIELDS = ("title", "summary", "content")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were with we our"
+    .split()
+)
+
+
+def _terms(text: str) -> list[str]:
+    """Lower-cased words (stopwords dropped) plus adjacent-word bigrams."""
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _document_key(item: dict) -> str:
+    """Identity of a result: its canonical URL, or its title when it has none."""
+    return canonical_url(item.get("url", "")) or item.get("title", "").strip().lower()
+
+
+class SemanticIndex:
+    """
+    In-memory semantic index over research results using hashed TF-IDF.
+
+    Each document is hashed into a fixed-size vector (signed feature
+    hashing of words and bigrams, sublinear term frequency), so adding
+    documents never re-tokenizes existing ones. Raw term-frequency rows live
+    in a growing NumPy matrix; IDF weights come from running document
+    frequencies and are applied at query time, where top-k cosine scores
+    are computed with two matrix-vector products.
+
+    The matrix never grows past `max_documents` rows (4 bytes * `dimensions`
+    each); once full, new documents replace the oldest ones.
+
+    Args:
+        dimensions (int): Length of the hashed vectors.
+        max_documents (int): Maximum number of documents kept in memory.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS, max_documents: int = DEFAULT_MAX_DOCUMENTS):
+        self.dimensions = dimensions
+        self.max_documents = max_documents
+        self.documents = []      # result dicts, row-aligned with the matrix
+        self.synced_until = 0.0  # created_at of the newest response-cache entry indexed
+        self._keys = {}          # canonical url / title -> row
+        self._next_evict = 0     # oldest row, overwritten once the index is full
+        self._matrix = np.zeros((min(INITIAL_CAPACITY, max_documents), dimensions), dtype=np.float32)
+        self._doc_freq = np.zeros(dimensions, dtype=np.float32)
+        self._row_norms = None   # cached |tf * idf| per row, reset on add
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _vector(self, text: str) -> np.ndarray:
+        terms = _terms(text)
+        hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in terms), dtype=np.uint32, count=len(terms))
+        signs = np.where(hashes & 0x80000000, 1.0, -1.0)
+        counts = np.bincount(hashes % self.dimensions, weights=signs, minlength=self.dimensions)
+        # Sublinear term frequency, keeping the hash sign
+        return (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+
+    def _idf(self) -> np.ndarray:
+        return np.log((1.0 + len(self.documents)) / (1.0 + self._doc_freq)) + 1.0
+
+    def add(self, results, source: str = None) -> int:
+        """
+        Adds result dicts (arXiv, Tavily or Wikipedia shape). Items already
+        indexed (same canonical URL, or same title when there is no URL) and
+        error entries are skipped. Returns the number of new documents.
+        """
+        added = 0
+        with self._lock:
+            for item in results or []:
+                if not isinstance(item, dict) or "error" in item:
+                    continue
+                key = _document_key(item)
+                text = " ".join(str(item[f]) for f in TEXT_FIELDS if item.get(f))
+                if not key or not text or key in self._keys:
+                    continue
+
+                document = {**item, "source": source} if source else dict(item)
+                row = len(self.documents)
+                if row >= self.max_documents:
+                    row = self._next_evict
+                    self._next_evict = (row + 1) % self.max_documents
+                    self._doc_freq -= self._matrix[row] != 0
+                    del self._keys[_document_key(self.documents[row])]
+                    self.documents[row] = document
+                else:
+                    if row == self._matrix.shape[0]:
+                        grown = np.zeros((min(row * 2, self.max_documents), self.dimensions), dtype=np.float32)
+                        grown[:row] = self._matrix
+                        self._matrix = grown
+                    self.documents.append(document)
+
+                vector = self._vector(text)
+                self._matrix[row] = vector
+                self._doc_freq += vector != 0
+                self._keys[key] = row
+                added += 1
+
+            if added:
+                self._row_norms = None
+        return added
+
+    def search(self, query: str, top_k: int = 5) -> list[dict]:
+        """
+        Returns up to `top_k` documents most similar to `query` (cosine over
+        IDF-weighted vectors), each with a `score` field, best first.
+        """
+        with self._lock:
+            count = len(self.documents)
+            if count == 0:
+                return []
+            matrix = self._matrix[:count]
+            idf = self._idf()
+            idf_squared = idf * idf
+            if self._row_norms is None:
+                self._row_norms = np.sqrt((matrix * matrix) @ idf_squared)
+            row_norms = self._row_norms
+
+            query_vector = self._vector(query)
+            query_norm = np.sqrt((query_vector * query_vector) @ idf_squared)
+            if query_norm == 0:
+                return []
+
+            scores = (matrix @ (query_vector * idf_squared)) / (row_norms * query_norm + 1e-12)
+            k = min(top_k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {**self.documents[i], "score": round(float(scores[i]), 4)}
+                for i in top if scores[i] > 0
+            ]
+
+    def save(self, path: str) -> None:
+        """Writes the index to a .npz file (vectors plus JSON documents)."""
+        with self._lock:
+            np.savez_compressed(
+                path,
+                matrix=self._matrix[:len(self.documents)],
+                doc_freq=self._doc_freq,
+                documents=np.array(json.dumps(self.documents)),
+                synced_until=self.synced_until,
+                next_evict=self._next_evict,
+            )
+
+    @classmethod
+    def load(cls, path: str, max_documents: int = DEFAULT_MAX_DOCUMENTS) -> "SemanticIndex":
+        """Reads an index written by `save`."""
+        with np.load(path) as data:
+            matrix = data["matrix"]
+            index = cls(dimensions=matrix.shape[1], max_documents=max(max_documents, len(matrix)))
+            spare = min(INITIAL_CAPACITY, index.max_documents - len(matrix))
+            index._matrix = np.vstack([matrix, np.zeros((spare, matrix.shape[1]), dtype=np.float32)])
+            index._doc_freq = data["doc_freq"]
+            index.documents = json.loads(str(data["documents"]))
+            if "synced_until" in data:
+                index.synced_until = float(data["synced_until"])
+                index._next_evict = int(data["next_evict"])
+        for row, item in enumerate(index.documents):
+            index._keys[_document_key(item)] = row
+        return index
+
+
+_default_index = SemanticIndex()
+_sync_lock = threading.Lock()
+
+
+def sync_from_cache(index: SemanticIndex = None) -> int:
+    """
+    Adds response-cache entries created since `index` was last synced
+    (default: the shared index). Each index keeps its own cursor in
+    `synced_until`. Returns the number of new documents.
+    """
+    index = _default_index if index is None else index
+    cache = get_default_cache()
+    if cache is None:
+        return 0
+    with _sync_lock:
+        added = 0
+        for tool, value, created_at in cache.items(since=index.synced_until):
+            if not is_error_result(value):
+                added += index.add(value if isinstance(value, list) else [value], source=tool)
+            index.synced_until = max(index.synced_until, created_at)
+        return added
+
+
+@instrumented_tool("semantic_search_tool")
+def semantic_search_tool(query: str, top_k: int = 5) -> list[dict]:
+    """
+    Searches earlier arXiv, web and Wikipedia results by meaning, without going online.
+
+    Args:
+        query (str): What to look for, in natural language.
+        top_k (int): Maximum number of results to return.
+    """
+    sync_from_cache()
+    results = _default_index.search(query, top_k)
+    if not results:
+        return [{"error": "No related results in the local research cache yet."}]
+    return results
+
+
+semantic_tool_def = function_schema(semantic_search_tool)
+register_tool(semantic_search_tool)
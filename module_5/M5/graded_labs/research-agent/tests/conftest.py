@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The lab modules are plain scripts next to the notebook, imported by name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep test runs off the on-disk response cache and out of replay mode
+os.environ["RESEARCH_TOOLS_CACHE"] = "0"
+os.environ.setdefault("RESEARCH_TOOLS_REPLAY", "off")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """A fresh response cache installed as the shared one."""
+    from tool_cache import ResponseCache, set_default_cache
+
+    monkeypatch.setenv("RESEARCH_TOOLS_CACHE", "1")
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    set_default_cache(cache)
+    yield cache
+    set_default_cache(None)
+    cache.close()
@@ -0,0 +1,50 @@
+import pytest
+
+from arxiv_harvest import harvest_arxiv, read_harvest
+from fake_arxiv_server import FakeArxivServer
+
+FAST = {"requests_per_second": 1000, "backoff": 0.01, "max_backoff": 0.05}
+
+
+def harvested_ids(path) -> list:
+    return [result["arxiv_id"] for result in read_harvest(path)]
+
+
+def test_harvest_walks_every_page_and_retries_failures(tmp_path):
+    out = tmp_path / "out.jsonl"
+    with FakeArxivServer(total_results=55, fail_every=3, retry_after=0) as server:
+        stats = harvest_arxiv("llm", str(out), max_results=100, page_size=20, api_url=server.url, **FAST)
+
+    assert stats["written"] == 55
+    assert stats["pages"] == 3
+    assert stats["retries"] > 0
+    assert len(set(harvested_ids(out))) == 55
+
+
+def test_harvest_drops_duplicate_papers(tmp_path):
+    out = tmp_path / "out.jsonl"
+    with FakeArxivServer(total_results=40, duplicate_every=5) as server:
+        stats = harvest_arxiv("llm", str(out), max_results=40, page_size=10, api_url=server.url, **FAST)
+
+    ids = harvested_ids(out)
+    assert stats["duplicates"] == 8
+    assert stats["written"] == len(ids) == len(set(ids)) == 32
+
+
+def test_harvest_resumes_without_rewriting_known_papers(tmp_path):
+    out = tmp_path / "out.jsonl"
+    with FakeArxivServer(total_results=50) as server:
+        first = harvest_arxiv("llm", str(out), max_results=30, page_size=10, api_url=server.url, **FAST)
+        second = harvest_arxiv("llm", str(out), max_results=50, page_size=10, api_url=server.url, **FAST)
+
+    assert first["written"] == 30
+    assert second["written"] == 20
+    assert second["duplicates"] == 30
+    assert harvested_ids(out) == sorted(set(harvested_ids(out)))
+
+
+def test_harvest_gives_up_after_max_retries(tmp_path):
+    with FakeArxivServer(fail_every=1) as server:
+        with pytest.raises(RuntimeError, match="failed after 3 attempts"):
+            harvest_arxiv("llm", str(tmp_path / "out.jsonl"), max_results=10, max_retries=2,
+                          api_url=server.url, **FAST)
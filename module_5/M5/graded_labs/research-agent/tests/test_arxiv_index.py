@@ -0,0 +1,28 @@
+import sqlite3
+
+import pytest
+
+from arxiv_index import ArxivIndex
+
+
+def paper(index: int, **fields) -> dict:
+    return {
+        "title": f"Paper {index} on retrieval",
+        "summary": f"Abstract {index} about retrieval augmented generation.",
+        "url": f"http://arxiv.org/abs/2401.{index:05d}v1",
+        **fields,
+    }
+
+
+def test_failed_add_is_rolled_back(tmp_path):
+    index = ArxivIndex(str(tmp_path / "index.sqlite"))
+    index.add([paper(1)])
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        index.add([paper(2), paper(3, title=["not", "text"])])  # second row cannot be bound
+    assert len(index) == 1
+    assert not index._conn.in_transaction
+
+    assert index.add([paper(2), paper(3)]) == 2
+    assert len(index) == 3
+    assert len(index.search("retrieval", 3)) == 3
@@ -0,0 +1,86 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import arxiv_pdf
+
+PdfWriter = pytest.importorskip("pypdf").PdfWriter  # optional dependency of arxiv_pdf
+
+
+def blank_pdf() -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pdf_server():
+    body = blank_pdf()
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            time.sleep(0.2)  # keep the download in flight while other threads arrive
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    host, port = httpd.server_address[:2]
+    yield f"http://{host}:{port}/pdf/2401.00001v1", requests_seen
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_concurrent_downloads_of_one_pdf_share_a_request(tmp_path, pdf_server):
+    url, requests_seen = pdf_server
+    dest = str(tmp_path / "2401.00001v1.pdf")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        paths = list(pool.map(lambda _: arxiv_pdf.download_pdf(url, dest), range(4)))
+    assert paths == [dest] * 4
+    assert len(requests_seen) == 1
+
+
+def test_duplicate_papers_are_downloaded_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESEARCH_TOOLS_PDF_DIR", str(tmp_path))
+    downloads = []
+
+    def fake_download(url, arxiv_id, version):
+        downloads.append(arxiv_id + version)
+        path = tmp_path / f"{arxiv_id}{version}.pdf"
+        path.write_bytes(blank_pdf())
+        return str(path)
+
+    monkeypatch.setattr(arxiv_pdf, "_download", fake_download)
+    papers = [
+        {"url": "http://arxiv.org/abs/2401.00001v1"},
+        {"link_pdf": "http://arxiv.org/pdf/2401.00001v1"},
+        {"url": "http://arxiv.org/abs/2401.00002v1"},
+        {"url": "http://arxiv.org/abs/2401.00001v1"},
+    ]
+    results = arxiv_pdf.fetch_paper_texts(papers)
+
+    assert sorted(downloads) == ["2401.00001v1", "2401.00002v1"]
+    assert [("full_text" in item, "pdf_error" in item) for item in results] == [(True, False)] * 4
+    assert results[1]["link_pdf"] == papers[1]["link_pdf"]
+
+
+def test_fulltext_tool_is_offered_to_the_agent():
+    import research_tools
+
+    assert research_tools.tool_mapping["arxiv_fulltext_tool"] is arxiv_pdf.arxiv_fulltext_tool
+    assert "arxiv_fulltext_tool" in research_tools.tool_registry.aisuite_tools()._tools
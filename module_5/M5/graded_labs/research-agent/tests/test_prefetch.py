@@ -0,0 +1,57 @@
+import threading
+import time
+
+from prefetch import Prefetcher
+from research_tools import arxiv_search_tool, tavily_search_tool
+
+STEPS = [
+    "Search arXiv for recent papers on quantum error correction.",
+    "Find the latest web news about quantum computing hardware.",
+    "Write the final report.",
+]
+
+
+def test_default_tools_bypass_the_metrics_wrappers():
+    with Prefetcher() as prefetcher:
+        assert prefetcher.tools["arxiv"] is arxiv_search_tool.__wrapped__
+        assert prefetcher.tools["tavily"] is tavily_search_tool.__wrapped__
+
+
+def test_prefetch_passes_max_results_and_forgets_finished_futures(cache):
+    calls = []
+    release = threading.Event()
+
+    def fake_tool(query, max_results=5):
+        release.wait(5)
+        calls.append((query, max_results))
+        return [{"title": query}]
+
+    with Prefetcher(max_results=12, tools={"arxiv": fake_tool, "tavily": fake_tool}) as prefetcher:
+        scheduled = prefetcher.update_plan(STEPS)
+        assert len(scheduled) == 2
+        assert len(prefetcher._futures) == 2
+
+        release.set()
+        prefetcher.wait(5)
+        deadline = time.monotonic() + 5  # done-callbacks run just after wait() wakes up
+        while prefetcher._futures and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert prefetcher._futures == {}
+        assert prefetcher.stats["completed"] == 2
+    assert sorted(calls) == sorted((query, 12) for _, query in scheduled)
+
+
+def test_sliding_plan_does_not_repeat_finished_prefetches(cache):
+    calls = []
+
+    def fake_tool(query, max_results=5):
+        calls.append(query)
+        return [{"title": query}]
+
+    # The executor loop re-sends the remaining steps before routing each one
+    with Prefetcher(tools={"arxiv": fake_tool, "tavily": fake_tool}) as prefetcher:
+        assert len(prefetcher.update_plan(STEPS)) == 2
+        prefetcher.wait(5)
+        assert prefetcher.update_plan(STEPS[1:]) == []
+        assert prefetcher.update_plan(STEPS[2:]) == []
+    assert len(calls) == 2
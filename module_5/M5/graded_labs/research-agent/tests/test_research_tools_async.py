@@ -0,0 +1,55 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import research_tools_async
+from fake_arxiv_server import FakeArxivServer
+from research_tools_async import aclose_clients, get_async_client, get_async_tavily_client
+
+
+def test_tavily_client_is_shared_per_loop_and_closed(monkeypatch):
+    monkeypatch.setenv("TAVILY_API_KEY", "tvly-test")
+    monkeypatch.delenv("DLAI_TAVILY_BASE_URL", raising=False)
+
+    async def scenario():
+        first = await get_async_tavily_client()
+        assert await get_async_tavily_client() is first
+
+        monkeypatch.setenv("TAVILY_API_KEY", "tvly-other")
+        second = await get_async_tavily_client()
+        assert second is not first
+        assert first._client.is_closed
+
+        http = get_async_client()
+        assert "Authorization" not in http.headers  # Tavily's token stays on its own client
+
+        await aclose_clients()
+        assert second._client.is_closed and http.is_closed
+        assert asyncio.get_running_loop() not in research_tools_async._tavily_clients
+
+    asyncio.run(scenario())
+
+
+def test_async_arxiv_search_retries_through_the_shared_breaker(monkeypatch):
+    monkeypatch.setattr(research_tools_async.resilient_session, "backoff", 0.01)
+    monkeypatch.setattr(research_tools_async.resilient_session, "max_backoff", 0.05)
+
+    with FakeArxivServer(total_results=20, fail_every=2, fail_status=503) as server:
+        monkeypatch.setattr(research_tools_async, "ARXIV_API_URL", server.url)
+
+        async def search(*queries):
+            try:
+                return [await research_tools_async.arxiv_search_tool_async(q, max_results=3) for q in queries]
+            finally:
+                await aclose_clients()
+
+        # Requests 1 and 3 succeed, the 2nd gets a 503 and is retried
+        _, results = asyncio.run(search("warmup", "kalman filter"))
+        assert [status for _, status in server.requests] == [200, 503, 200]
+        assert [paper["title"] for paper in results] == [f"Paper {i} on kalman filter" for i in (1, 2, 3)]
+
+        breaker = research_tools_async.resilient_session.breaker(urlsplit(server.url).netloc)
+        breaker.state, breaker.opened_at = breaker.OPEN, time.monotonic()
+        [results] = asyncio.run(search("kalman filter"))
+        assert "circuit open" in results[0]["error"]
+        assert len(server.requests) == 3
@@ -0,0 +1,131 @@
+import time
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from fake_arxiv_server import FakeArxivServer
+from resilience import CircuitBreaker, CircuitOpenError, ResilientSession
+
+
+def make_session(**kwargs) -> ResilientSession:
+    kwargs.setdefault("backoff", 0.01)
+    kwargs.setdefault("max_backoff", 0.05)
+    return ResilientSession(requests.Session(), **kwargs)
+
+
+class RaisingSession:
+    """Stand-in for requests.Session whose GETs raise `error`."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+def test_retries_failed_request_until_it_succeeds():
+    with FakeArxivServer(fail_every=2) as server:
+        session = make_session(max_retries=2)
+        session.get(server.url, params={"search_query": "all:x"}, timeout=5)  # request 1
+        response = session.get(server.url, params={"search_query": "all:x"}, timeout=5)  # 503, then 200
+
+    assert response.status_code == 200
+    assert session.stats["retries"] == 1
+    assert [status for _, status in server.requests] == [200, 503, 200]
+
+
+def test_returns_last_retryable_response_when_retries_run_out():
+    with FakeArxivServer(fail_every=1, fail_status=429, retry_after=0) as server:
+        session = make_session(max_retries=2, failure_threshold=10)
+        response = session.get(server.url, timeout=5)
+
+    assert response.status_code == 429
+    assert len(server.requests) == 3
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    session = make_session(backoff=1.0, max_backoff=4.0)
+    for attempt in range(6):
+        assert 0 <= session._retry_delay(attempt) <= min(4.0, 2 ** attempt)
+
+    response = requests.Response()
+    response.headers["Retry-After"] = "2"
+    assert session._retry_delay(0, response) == 2.0
+    response.headers["Retry-After"] = "120"
+    assert session._retry_delay(0, response) == 4.0
+
+
+def test_total_timeout_bounds_all_attempts():
+    with FakeArxivServer(latency=1.0) as server:
+        session = make_session(max_retries=5, failure_threshold=100)
+        start = time.monotonic()
+        with pytest.raises(requests.exceptions.Timeout):
+            session.get(server.url, timeout=30, total_timeout=0.3)
+        assert time.monotonic() - start < 0.9
+
+
+def test_breaker_opens_then_half_open_trial_closes_it():
+    with FakeArxivServer(fail_every=1) as server:
+        session = make_session(max_retries=0, failure_threshold=3, reset_timeout=0.2)
+        for _ in range(3):
+            assert session.get(server.url, timeout=5).status_code == 503
+        breaker = session.breaker(urlsplit(server.url).netloc)
+        assert breaker.state == CircuitBreaker.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            session.get(server.url, timeout=5)
+        assert len(server.requests) == 3  # short-circuited, nothing sent
+
+        server.fail_every = 0
+        time.sleep(0.25)
+        assert session.get(server.url, timeout=5).status_code == 200
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert session.stats["short_circuits"] == 1
+
+
+def test_failed_half_open_trial_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()          # the single trial
+    assert not breaker.allow()      # no second request while it is in flight
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_unexpected_exception_does_not_leave_trial_stuck():
+    session = ResilientSession(
+        RaisingSession(requests.exceptions.TooManyRedirects("redirect loop")),
+        max_retries=0, failure_threshold=1, reset_timeout=0.05,
+    )
+    breaker = session.breaker("example.org")
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    with pytest.raises(requests.exceptions.TooManyRedirects):
+        session.get("http://example.org/api")  # the half-open trial
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # The next trial is let through once the circuit has cooled down again
+    time.sleep(0.06)
+    with pytest.raises(requests.exceptions.TooManyRedirects):
+        session.get("http://example.org/api")
+    assert session.session.calls == 2
+
+
+def test_hedged_request_wins_over_a_straggler():
+    with FakeArxivServer(slow_every=2, slow_latency=2.0) as server:
+        session = make_session(hedge=0.1)
+        session.get(server.url, timeout=5)  # request 1 is fast
+        start = time.monotonic()
+        response = session.get(server.url, timeout=5)  # request 2 straggles, 3 is the hedge
+        elapsed = time.monotonic() - start
+
+    assert response.status_code == 200
+    assert elapsed < 1.0
+    assert session.stats["hedges"] == 1
+    assert session.stats["hedge_wins"] == 1
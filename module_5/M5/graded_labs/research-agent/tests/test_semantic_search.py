@@ -0,0 +1,49 @@
+import semantic_search
+from semantic_search import SemanticIndex, sync_from_cache
+
+
+def paper(index: int) -> dict:
+    return {
+        "title": f"Paper {index} on retrieval",
+        "summary": f"Abstract {index} about retrieval augmented generation.",
+        "url": f"http://arxiv.org/abs/2401.{index:05d}v1",
+    }
+
+
+def test_each_index_keeps_its_own_sync_cursor(cache, monkeypatch):
+    monkeypatch.setattr(semantic_search, "_default_index", SemanticIndex())
+    cache.set("k1", "arxiv_search_tool", [paper(1), paper(2)])
+
+    custom = SemanticIndex()
+    assert sync_from_cache(custom) == 2
+    assert sync_from_cache() == 2  # the shared index has not seen the entry yet
+    assert sync_from_cache(custom) == 0
+
+    cache.set("k2", "arxiv_search_tool", [paper(3)])
+    assert sync_from_cache(custom) == 1
+    assert len(semantic_search._default_index) == 2
+
+
+def test_full_index_replaces_oldest_documents(tmp_path):
+    index = SemanticIndex(dimensions=64, max_documents=3)
+    assert index.add([paper(i) for i in range(1, 6)]) == 5
+    assert len(index) == 3
+    assert index._matrix.shape[0] == 3
+    assert {doc["title"] for doc in index.documents} == {f"Paper {i} on retrieval" for i in (3, 4, 5)}
+    assert index.add([paper(1)]) == 1  # evicted earlier, so it is new again
+    assert index.add([paper(5)]) == 0
+
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = SemanticIndex.load(path, max_documents=3)
+    assert len(loaded) == 3
+    assert loaded.add([paper(6)]) == 1
+    assert len(loaded) == 3
+    assert "Paper 4 on retrieval" not in {doc["title"] for doc in loaded.documents}
+
+
+def test_semantic_search_tool_is_offered_to_the_agent():
+    import research_tools
+
+    assert research_tools.tool_mapping["semantic_search_tool"] is semantic_search.semantic_search_tool
+    assert research_tools.tool_registry.definition("semantic_search_tool")["function"]["parameters"]["required"] == ["query"]
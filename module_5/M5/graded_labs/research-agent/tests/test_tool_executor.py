@@ -0,0 +1,25 @@
+import time
+
+from tool_executor import execute_tool_calls
+
+
+def slow(seconds: float) -> list[dict]:
+    time.sleep(seconds)
+    return [{"slept": seconds}]
+
+
+def call(seconds: float) -> dict:
+    return {"id": f"call_{seconds}", "function": {"name": "slow", "arguments": {"seconds": seconds}}}
+
+
+def test_timed_out_calls_do_not_hold_up_the_calls_queued_behind_them():
+    calls = [call(1.5), call(1.6), call(0), call(0.01)]
+
+    start = time.monotonic()
+    results = execute_tool_calls(calls, {"slow": slow}, max_workers=1, timeout=0.3)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.0  # two timeouts back to back, not 1.5 s + 1.6 s
+    assert results[0] == [{"error": "slow timed out after 0.3s"}]
+    assert results[1] == [{"error": "slow timed out after 0.3s"}]
+    assert results[2:] == [[{"slept": 0}], [{"slept": 0.01}]]
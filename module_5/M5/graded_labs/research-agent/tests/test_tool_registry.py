@@ -0,0 +1,62 @@
+import json
+import time
+
+from token_budget import ToolResultBudget, estimate_tokens
+from tool_registry import ToolRegistry
+
+
+def slow_search(query: str, max_results: int = 2) -> list[dict]:
+    """
+    Pretends to be a slow backend.
+
+    Args:
+        query (str): Search keywords.
+        max_results (int): Number of results.
+    """
+    time.sleep(0.3)
+    return [{"title": f"{query} {i}", "summary": "word " * 400} for i in range(max_results)]
+
+
+def tool_call(call_id: str, name: str, arguments: dict) -> dict:
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+def test_aisuite_tools_run_a_turns_calls_concurrently():
+    tools = ToolRegistry([slow_search]).aisuite_tools()
+    calls = [tool_call(f"call_{i}", "slow_search", {"query": f"q{i}"}) for i in range(4)]
+
+    start = time.monotonic()
+    results, messages = tools.execute_tool(calls)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.9  # 4 x 0.3 s one after another
+    assert [m["tool_call_id"] for m in messages] == ["call_0", "call_1", "call_2", "call_3"]
+    assert results[2][0]["title"] == "q2 0"
+    assert json.loads(messages[0]["content"]) == results[0]
+
+
+def test_aisuite_tools_report_bad_arguments_as_results():
+    tools = ToolRegistry([slow_search]).aisuite_tools()
+    results, messages = tools.execute_tool([
+        tool_call("ok", "slow_search", {"query": "a", "max_results": 1}),
+        tool_call("bad", "slow_search", {"max_results": "many"}),
+        tool_call("unknown", "no_such_tool", {}),
+    ])
+
+    assert len(results[0]) == 1
+    assert "error" in results[1][0]
+    assert results[2] == [{"error": "Unknown tool: no_such_tool"}]
+    assert len(messages) == 3
+
+
+def test_aisuite_tools_trim_results_to_the_budget():
+    registry = ToolRegistry([slow_search])
+    budget = ToolResultBudget(per_call_tokens=200, per_conversation_tokens=1000)
+    tools = registry.aisuite_tools(budget=budget)
+    assert registry.aisuite_tools().budget is None  # the shared instance stays unbudgeted
+
+    results, messages = tools.execute_tool([tool_call("c1", "slow_search", {"query": "a"})])
+
+    assert estimate_tokens(json.dumps(results[0])) > 200  # raw result
+    assert estimate_tokens(messages[0]["content"]) <= 200  # what enters the conversation
+    assert budget.stats()["calls"] == 1 and budget.saved_tokens > 0
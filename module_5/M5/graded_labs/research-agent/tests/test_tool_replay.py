@@ -0,0 +1,62 @@
+import pytest
+
+import arxiv_pdf
+import research_tools
+from fake_arxiv_server import FakeArxivServer
+from research_batch import arxiv_search_batch
+
+
+@pytest.fixture
+def fixtures(tmp_path, monkeypatch):
+    """Fixture store and PDF directory in a temporary folder."""
+    monkeypatch.setenv("RESEARCH_TOOLS_FIXTURES", str(tmp_path / "fixtures.jsonl.gz"))
+    monkeypatch.setenv("RESEARCH_TOOLS_PDF_DIR", str(tmp_path / "pdfs"))
+    return tmp_path
+
+
+def set_mode(monkeypatch, mode):
+    monkeypatch.setenv("RESEARCH_TOOLS_REPLAY", mode)
+
+
+def test_search_is_replayed_without_network(fixtures, monkeypatch):
+    with FakeArxivServer(total_results=20) as server:
+        monkeypatch.setattr(research_tools, "ARXIV_API_URL", server.url)
+        set_mode(monkeypatch, "record")
+        recorded = research_tools.arxiv_search_tool("graph neural networks", max_results=3)
+
+    set_mode(monkeypatch, "replay")
+    assert research_tools.arxiv_search_tool("Graph  Neural Networks", max_results=3) == recorded
+    missing = research_tools.arxiv_search_tool("something else", max_results=3)
+    assert "No recorded fixture" in missing[0]["error"]
+
+
+def test_batched_id_lookups_are_replayed(fixtures, monkeypatch):
+    queries = ["2401.00003", "transformers", "2401.00005v1"]
+    with FakeArxivServer(total_results=20) as server:
+        monkeypatch.setattr(research_tools, "ARXIV_API_URL", server.url)
+        set_mode(monkeypatch, "record")
+        recorded = arxiv_search_batch(queries, max_results=2)
+        assert any("id_list" in path for path, _ in server.requests)
+
+    set_mode(monkeypatch, "replay")
+    replayed = arxiv_search_batch(queries, max_results=2)
+    assert replayed == recorded
+    assert replayed[0][0]["url"].endswith("2401.00003v1")
+
+
+def test_pdf_text_is_replayed_without_download(fixtures, monkeypatch):
+    paper = {"url": "http://arxiv.org/abs/2401.00007v1", "link_pdf": "http://arxiv.org/pdf/2401.00007v1"}
+    pdf_dir = fixtures / "pdfs"
+    pdf_dir.mkdir()
+    (pdf_dir / "2401.00007v1.txt").write_text("Full text of the paper.", encoding="utf-8")
+
+    set_mode(monkeypatch, "record")
+    assert arxiv_pdf.fetch_paper_texts([paper])[0]["full_text"] == "Full text of the paper."
+
+    (pdf_dir / "2401.00007v1.txt").unlink()
+    monkeypatch.setattr(arxiv_pdf, "_download", lambda *args: pytest.fail("replay mode downloaded a PDF"))
+    set_mode(monkeypatch, "replay")
+    assert arxiv_pdf.fetch_paper_texts([paper])[0]["full_text"] == "Full text of the paper."
+
+    other = {"url": "http://arxiv.org/abs/2401.00008v1"}
+    assert "replay mode" in arxiv_pdf.fetch_paper_texts([other])[0]["pdf_error"]
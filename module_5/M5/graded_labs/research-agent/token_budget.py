@@ -0,0 +1,137 @@
+# --- Standard library ---
+import json
+import logging
+import math
+import threading
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4  # rough average for English text with GPT-style tokenizers
+DEFAULT_PER_CALL_TOKENS = 1500
+DEFAULT_PER_CONVERSATION_TOKENS = 12000
+DEFAULT_TRIM_FIELDS = ("summary", "content")
+MIN_FIELD_TOKENS = 8  # never cut a field below this many tokens
+ELLIPSIS = " ..."  # ASCII, so json.dumps does not escape it into more characters
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local token estimate (~4 characters per token). Good enough for
+    budgeting; no tokenizer download or model-specific vocabulary needed.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max(0, max_chars - len(ELLIPSIS))]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + ELLIPSIS
+
+
+def _field_cap(lengths: list[int], available: int) -> int:
+    """
+    Largest per-field token cap such that the capped lengths fit in
+    `available` (water-filling: short fields keep their full text).
+    """
+    remaining = available
+    count = len(lengths)
+    for length in sorted(lengths):
+        if length * count <= remaining:
+            remaining -= length
+            count -= 1
+        else:
+            return max(MIN_FIELD_TOKENS, remaining // count)
+    return max(lengths, default=0)
+
+
+class ToolResultBudget:
+    """
+    Trims tool results before they are serialized into the conversation so
+    every call fits a per-call budget and all calls together fit a
+    per-conversation budget.
+
+    Long text fields (`trim_fields`, e.g. arXiv abstracts and Tavily page
+    content) are shortened first, evenly across results; if the results
+    still do not fit, trailing results are dropped (at least one is kept).
+
+    Args:
+        per_call_tokens (int): Maximum estimated tokens for one tool result.
+        per_conversation_tokens (int): Maximum for all results in the conversation.
+        trim_fields (tuple): Fields that may be shortened.
+    """
+
+    def __init__(
+        self,
+        per_call_tokens: int = DEFAULT_PER_CALL_TOKENS,
+        per_conversation_tokens: int = DEFAULT_PER_CONVERSATION_TOKENS,
+        trim_fields: tuple = DEFAULT_TRIM_FIELDS,
+    ):
+        self.per_call_tokens = per_call_tokens
+        self.per_conversation_tokens = per_conversation_tokens
+        self.trim_fields = trim_fields
+        self.used_tokens = 0
+        self.saved_tokens = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining_tokens(self) -> int:
+        return max(0, self.per_conversation_tokens - self.used_tokens)
+
+    def fit(self, result, tool_name: str = "tool"):
+        """
+        Returns `result` trimmed to the current budget and charges its size
+        against the conversation budget.
+        """
+        with self._lock:
+            budget = min(self.per_call_tokens, self.remaining_tokens)
+            before = estimate_tokens(json.dumps(result))
+            fitted = self._trim(result, budget) if before > budget else result
+            after = estimate_tokens(json.dumps(fitted))
+
+            self.calls += 1
+            self.used_tokens += after
+            self.saved_tokens += before - after
+
+        if after < before:
+            logger.info(
+                "%s result trimmed from ~%d to ~%d tokens (saved ~%d, ~%d left in conversation budget)",
+                tool_name, before, after, before - after, self.remaining_tokens,
+            )
+        return fitted
+
+    def _trim(self, result, budget: int):
+        if not isinstance(result, list):
+            result = [result]
+        items = [dict(item) if isinstance(item, dict) else item for item in result]
+
+        # Size of everything except the trimmable text, then share the rest.
+        texts = []
+        for item in items:
+            if isinstance(item, dict):
+                for field in self.trim_fields:
+                    if isinstance(item.get(field), str):
+                        texts.append((item, field, item[field]))
+                        item[field] = ""
+        overhead = estimate_tokens(json.dumps(items))
+        # One token of slack per field absorbs per-field rounding.
+        available = budget - overhead - len(texts)
+        cap = _field_cap([estimate_tokens(text) for _, _, text in texts], available)
+        for item, field, text in texts:
+            item[field] = _truncate(text, cap)
+
+        while len(items) > 1 and estimate_tokens(json.dumps(items)) > budget:
+            items.pop()
+        return items
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "used_tokens": self.used_tokens,
+            "saved_tokens": self.saved_tokens,
+            "remaining_tokens": self.remaining_tokens,
+        }
@@ -0,0 +1,327 @@
+# --- Standard library ---
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Defaults (overridable through environment variables, read lazily so that
+# values loaded by `load_dotenv()` in research_tools are honoured)
+DEFAULT_CACHE_PATH = ".research_tools_cache.sqlite"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+# Outcome of the innermost `cached_tool` lookup in the current context:
+# "hit", "miss", "off" (caching disabled) or None (no cached tool ran).
+_cache_status = contextvars.ContextVar("research_tools_cache_status", default=None)
+
+
+def last_cache_status() -> str | None:
+    """Cache outcome of the last `cached_tool` call made in this thread/task."""
+    return _cache_status.get()
+
+
+def clear_cache_status() -> None:
+    """Forgets the last cache outcome (call before a tool to attribute it)."""
+    _cache_status.set(None)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Lower-cases a query and collapses whitespace so that trivially different
+    spellings of the same search share one cache entry.
+    """
+    return " ".join(str(query).lower().split())
+
+
+def make_cache_key(tool_name: str, query: str, **params) -> str:
+    """
+    Builds a content-addressed key for a tool call.
+
+    Args:
+        tool_name (str): Name of the tool, e.g. "arxiv_search_tool".
+        query (str): The search query (normalized before hashing).
+        **params: Remaining call arguments (max_results, flags, ...).
+
+    Returns:
+        str: Hex SHA-256 digest identifying the request.
+    """
+    payload = json.dumps(
+        {"tool": tool_name, "query": normalize_query(query), "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def request_key(tool_name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """
+    Cache key of a call to a tool with the given signature: the `query`
+    argument plus every other argument after defaults are applied.
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+    return make_cache_key(tool_name, params.pop("query"), **params)
+
+
+def is_error_result(result) -> bool:
+    """True if a tool returned the `[{"error": ...}]` failure shape."""
+    if isinstance(result, dict):
+        return "error" in result
+    return (
+        isinstance(result, list)
+        and len(result) == 1
+        and isinstance(result[0], dict)
+        and "error" in result[0]
+    )
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of tool responses with TTL expiry and an LRU size limit.
+
+    Entries survive restarts, so repeated agent runs and grader reruns of the
+    same query are served from disk instead of the network.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                value TEXT NOT NULL,
+                elapsed REAL NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+
+    def get(self, key: str):
+        """
+        Returns the cached value for `key`, or None on a miss or expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, elapsed, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, elapsed, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            self.saved_seconds += elapsed
+
+        return json.loads(value)
+
+    def set(self, key: str, tool_name: str, value, elapsed: float = 0.0) -> None:
+        """
+        Stores `value` under `key` and evicts least-recently-used entries
+        beyond `max_entries`.
+
+        Args:
+            key (str): Cache key from `make_cache_key`.
+            tool_name (str): Tool that produced the value.
+            value: JSON-serializable tool result.
+            elapsed (float): Seconds the uncached call took (used for stats).
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, tool, value, elapsed, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, tool_name, json.dumps(value), elapsed, now, now),
+            )
+            if self.max_entries is not None:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+                overflow = count - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                        (overflow,),
+                    )
+
+    def purge_expired(self) -> int:
+        """Deletes every expired entry and returns how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+        return cur.rowcount
+
+    def items(self, since: float = 0.0) -> list[tuple]:
+        """
+        Returns (tool, value, created_at) for entries created after `since`,
+        oldest first, so readers can follow the cache incrementally.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tool, value, created_at FROM responses WHERE created_at > ? ORDER BY created_at",
+                (since,),
+            ).fetchall()
+        return [(tool, json.loads(value), created_at) for tool, value, created_at in rows]
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+            self.saved_seconds = 0.0
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters and the network time saved by cache hits.
+        """
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+_cache_disabled = False
+
+
+def get_default_cache():
+    """
+    Returns the shared cache used by `cached_tool`, creating it on first use.
+
+    Configured through RESEARCH_TOOLS_CACHE_PATH, RESEARCH_TOOLS_CACHE_TTL and
+    RESEARCH_TOOLS_CACHE_MAX_ENTRIES. Set RESEARCH_TOOLS_CACHE=0 to disable.
+    """
+    global _default_cache
+    if _cache_disabled or os.getenv("RESEARCH_TOOLS_CACHE", "1") == "0":
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                path=os.getenv("RESEARCH_TOOLS_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl_seconds=float(os.getenv("RESEARCH_TOOLS_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                max_entries=int(os.getenv("RESEARCH_TOOLS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+        return _default_cache
+
+
+def set_default_cache(cache) -> None:
+    """
+    Replaces the shared cache. Pass None to disable caching entirely.
+    """
+    global _default_cache, _cache_disabled
+    with _default_cache_lock:
+        _default_cache = cache
+        _cache_disabled = cache is None
+
+
+def cache_stats() -> dict:
+    """Stats of the shared cache (empty dict when caching is disabled)."""
+    cache = get_default_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def cached_tool(tool_name: str, cache: ResponseCache = None):
+    """
+    Decorator that serves a search tool from the response cache.
+
+    The wrapped function must take the search string as its `query` argument;
+    every other argument (after defaults are applied) becomes part of the key.
+    Error results are never cached. Coroutine functions are supported too.
+
+    Args:
+        tool_name (str): Name used in the cache key.
+        cache (ResponseCache): Explicit cache; defaults to `get_default_cache()`.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def lookup(args, kwargs):
+            active = cache if cache is not None else get_default_cache()
+            if active is None:
+                _cache_status.set("off")
+                return None, None, None
+
+            key = request_key(tool_name, signature, args, kwargs)
+            cached = active.get(key)
+            _cache_status.set("miss" if cached is None else "hit")
+            return active, key, cached
+
+        def store(active, key, result, elapsed):
+            if active is not None and not is_error_result(result):
+                active.set(key, tool_name, result, elapsed)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                active, key, cached = lookup(args, kwargs)
+                if cached is not None:
+                    return cached
+
+                start = time.perf_counter()
+                result = await func(*args, **kwargs)
+                store(active, key, result, time.perf_counter() - start)
+                return result
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                active, key, cached = lookup(args, kwargs)
+                if cached is not None:
+                    return cached
+
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                store(active, key, result, time.perf_counter() - start)
+                return result
+
+        return wrapper
+
+    return decorator
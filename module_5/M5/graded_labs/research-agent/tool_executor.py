@@ -0,0 +1,151 @@
+# --- Standard library ---
+import json
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 30.0
+
+
+def _unpack_tool_call(tool_call) -> tuple:
+    """
+    Returns (id, name, raw_arguments) for an OpenAI/aisuite tool call object
+    or a plain dict shaped like one.
+    """
+    if isinstance(tool_call, dict):
+        function = tool_call.get("function", tool_call)
+        call_id = tool_call.get("id")
+        name = function.get("name")
+        arguments = function.get("arguments") or {}
+    else:
+        call_id = getattr(tool_call, "id", None)
+        name = tool_call.function.name
+        arguments = tool_call.function.arguments or {}
+    return call_id, name, arguments
+
+
+def _parse_arguments(arguments) -> dict:
+    """Decodes JSON-encoded tool arguments."""
+    if isinstance(arguments, str):
+        return json.loads(arguments) if arguments.strip() else {}
+    return dict(arguments)
+
+
+def execute_tool_calls(
+    tool_calls: list,
+    tool_map: dict = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> list:
+    """
+    Runs the independent tool calls of one LLM turn concurrently.
+
+    Args:
+        tool_calls (list): Tool calls from `response.choices[0].message.tool_calls`.
+        tool_map (dict): Tool name -> function. Defaults to `research_tools.tool_mapping`.
+        max_workers (int): Upper bound on calls running at once; a call
+            abandoned after `timeout` frees its slot for the next one.
+        timeout (float): Seconds each call may run before it is abandoned.
+
+    Returns:
+        list: One result per tool call, in the same order as `tool_calls`.
+        Failures (unknown tool, bad arguments, exception, timeout) come back
+        as `[{"error": ...}]`, like the tools themselves report errors.
+    """
+    if tool_map is None:
+        from research_tools import tool_mapping as tool_map
+
+    results = [None] * len(tool_calls)
+    queued = deque()  # (index, name, func, arguments) waiting for a free slot
+    for index, tool_call in enumerate(tool_calls):
+        try:
+            _, name, arguments = _unpack_tool_call(tool_call)
+            arguments = _parse_arguments(arguments)
+        except (AttributeError, TypeError, ValueError) as e:
+            results[index] = [{"error": f"Invalid tool call: {e}"}]
+            continue
+
+        func = tool_map.get(name)
+        if func is None:
+            results[index] = [{"error": f"Unknown tool: {name}"}]
+            continue
+        queued.append((index, name, func, arguments))
+
+    # One thread per call: an abandoned call keeps its thread busy, so a
+    # smaller pool would make the calls queued behind it wait for it anyway.
+    # `max_workers` instead limits how many calls are live at once.
+    executor = ThreadPoolExecutor(max_workers=max(1, len(queued)))
+    max_workers = max(1, max_workers)
+    pending = {}  # future -> (index, name, deadline)
+    try:
+        while queued or pending:
+            while queued and len(pending) < max_workers:
+                index, name, func, arguments = queued.popleft()
+                pending[executor.submit(func, **arguments)] = (index, name, time.monotonic() + timeout)
+
+            # Abandon calls that have been running longer than the timeout.
+            # Running threads cannot be interrupted, so their late results
+            # are simply discarded; the slot goes to the next queued call.
+            now = time.monotonic()
+            for future, (index, name, deadline) in list(pending.items()):
+                if now >= deadline and not future.done():
+                    results[index] = [{"error": f"{name} timed out after {timeout:g}s"}]
+                    del pending[future]
+            if not pending:
+                continue
+
+            wait_for = max(0.0, min(deadline for _, _, deadline in pending.values()) - now)
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, name, _ = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = [{"error": str(e)}]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
+
+def build_tool_messages(tool_calls: list, results: list, budget=None) -> list:
+    """
+    Turns executed tool calls and their results into `role: tool` messages,
+    preserving the original order.
+
+    Args:
+        tool_calls (list): The tool calls, as passed to `execute_tool_calls`.
+        results (list): Their results, in the same order.
+        budget (token_budget.ToolResultBudget): Optional budget used to trim
+            each result before it is serialized into the conversation.
+    """
+    messages = []
+    for tool_call, result in zip(tool_calls, results):
+        call_id, name, _ = _unpack_tool_call(tool_call)
+        if budget is not None:
+            result = budget.fit(result, tool_name=name)
+        messages.append({
+            "role": "tool",
+            "tool_call_id": call_id,
+            "name": name,
+            "content": json.dumps(result)
+        })
+    return messages
+
+
+def run_tool_calls(
+    tool_calls: list,
+    tool_map: dict = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    budget=None,
+) -> list:
+    """
+    Convenience wrapper: executes the calls concurrently and returns the
+    `role: tool` messages ready to append to the conversation, trimmed to
+    `budget` (a `token_budget.ToolResultBudget`) when one is given.
+    """
+    results = execute_tool_calls(tool_calls, tool_map, max_workers=max_workers, timeout=timeout)
+    return build_tool_messages(tool_calls, results, budget=budget)
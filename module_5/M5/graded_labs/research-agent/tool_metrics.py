@@ -0,0 +1,236 @@
+# --- Standard library ---
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+# --- Local / project ---
+from tool_cache import clear_cache_status, is_error_result, last_cache_status
+
+# Histogram bucket upper bounds (Prometheus "le" labels); +Inf is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class _Series:
+    """Counters and histograms for one (tool, cache status) pair."""
+
+    __slots__ = ("calls", "errors", "latency_buckets", "latency_sum", "payload_buckets", "payload_sum")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.payload_buckets = [0] * (len(PAYLOAD_BUCKETS) + 1)
+        self.payload_sum = 0
+
+
+def _cumulative(counts: list[int]) -> list[int]:
+    total, out = 0, []
+    for count in counts:
+        total += count
+        out.append(total)
+    return out
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+class ToolMetrics:
+    """
+    In-process registry of per-tool call metrics: latency and payload-size
+    histograms, error counts and cache status (hit / miss / off / none).
+
+    Recording a call costs a lock, two bisects and a `json.dumps` of the
+    result, so it can stay enabled in production.
+
+    Args:
+        events_path (str): Optional JSON-lines file that also receives one
+            event per call (defaults to RESEARCH_TOOLS_METRICS_LOG, if set).
+    """
+
+    def __init__(self, events_path: str = None):
+        self.events_path = events_path or os.getenv("RESEARCH_TOOLS_METRICS_LOG") or None
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, seconds: float, payload_bytes: int, error: bool, cache_status: str) -> None:
+        with self._lock:
+            series = self._series.get((tool, cache_status))
+            if series is None:
+                series = self._series[(tool, cache_status)] = _Series()
+            series.calls += 1
+            series.errors += bool(error)
+            series.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            series.latency_sum += seconds
+            series.payload_buckets[bisect.bisect_left(PAYLOAD_BUCKETS, payload_bytes)] += 1
+            series.payload_sum += payload_bytes
+
+            if self.events_path:
+                event = {
+                    "ts": round(time.time(), 3), "tool": tool, "seconds": round(seconds, 6),
+                    "bytes": payload_bytes, "error": bool(error), "cache": cache_status,
+                }
+                with open(self.events_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(event) + "\n")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> list[dict]:
+        """One summary dict per (tool, cache status), sorted by tool."""
+        with self._lock:
+            items = sorted(self._series.items())
+            return [
+                {
+                    "tool": tool,
+                    "cache": cache_status,
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "error_rate": round(s.errors / s.calls, 4) if s.calls else 0.0,
+                    "latency_seconds_sum": round(s.latency_sum, 6),
+                    "latency_seconds_mean": round(s.latency_sum / s.calls, 6) if s.calls else 0.0,
+                    "latency_buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], _cumulative(s.latency_buckets))),
+                    "payload_bytes_sum": s.payload_sum,
+                    "payload_buckets": dict(zip([*map(str, PAYLOAD_BUCKETS), "+Inf"], _cumulative(s.payload_buckets))),
+                }
+                for (tool, cache_status), s in items
+            ]
+
+    def to_jsonl(self) -> str:
+        """Current summaries as JSON lines (one line per tool and cache status)."""
+        return "".join(json.dumps(row) + "\n" for row in self.snapshot())
+
+    def to_prometheus(self) -> str:
+        """Current metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._series.items())
+            lines = [
+                "# HELP research_tool_calls_total Research tool calls.",
+                "# TYPE research_tool_calls_total counter",
+            ]
+            for (tool, cache_status), s in items:
+                lines.append(f"research_tool_calls_total{{{_labels(tool=tool, cache=cache_status)}}} {s.calls}")
+
+            lines += [
+                "# HELP research_tool_errors_total Research tool calls that returned or raised an error.",
+                "# TYPE research_tool_errors_total counter",
+            ]
+            for (tool, cache_status), s in items:
+                lines.append(f"research_tool_errors_total{{{_labels(tool=tool, cache=cache_status)}}} {s.errors}")
+
+            for name, help_text, bounds, counts_of, sum_of in (
+                ("research_tool_latency_seconds", "Research tool call latency.",
+                 LATENCY_BUCKETS, lambda s: s.latency_buckets, lambda s: s.latency_sum),
+                ("research_tool_response_bytes", "Size of the JSON-serialized tool result.",
+                 PAYLOAD_BUCKETS, lambda s: s.payload_buckets, lambda s: s.payload_sum),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (tool, cache_status), s in items:
+                    labels = _labels(tool=tool, cache=cache_status)
+                    for bound, count in zip([*map(str, bounds), "+Inf"], _cumulative(counts_of(s))):
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {sum_of(s)}")
+                    lines.append(f"{name}_count{{{labels}}} {s.calls}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry used by `instrumented_tool` unless another one is passed
+default_metrics = ToolMetrics()
+
+
+def _payload_size(result) -> int:
+    try:
+        return len(json.dumps(result))
+    except (TypeError, ValueError):
+        return len(str(result))
+
+
+def instrumented_tool(tool_name: str = None, metrics: ToolMetrics = None):
+    """
+    Decorator that records latency, payload size, errors and cache status of
+    every call in `metrics` (default: `default_metrics`).
+
+    The wrapper keeps the tool's name, signature and docstring, so aisuite
+    still builds the same tool schema from it. Coroutine functions are
+    supported too.
+
+    Args:
+        tool_name (str): Label used in the metrics; defaults to the function name.
+        metrics (ToolMetrics): Registry to record into.
+    """
+    def decorator(func):
+        name = tool_name or func.__name__
+
+        def finish(start, result, error):
+            cache_status = last_cache_status() or "none"
+            registry = metrics if metrics is not None else default_metrics
+            registry.record(
+                name,
+                time.perf_counter() - start,
+                0 if error else _payload_size(result),
+                error or is_error_result(result),
+                cache_status,
+            )
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                clear_cache_status()
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    finish(start, None, True)
+                    raise
+                finish(start, result, False)
+                return result
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                clear_cache_status()
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    finish(start, None, True)
+                    raise
+                finish(start, result, False)
+                return result
+
+        wrapper.__instrumented__ = True
+        return wrapper
+
+    return decorator
+
+
+def _instrument(func, metrics: ToolMetrics = None):
+    if getattr(func, "__instrumented__", False):
+        return func
+    return instrumented_tool(metrics=metrics)(func)
+
+
+def instrument_mapping(tool_map: dict, metrics: ToolMetrics = None) -> dict:
+    """
+    Returns a copy of a name -> function tool mapping with every function
+    instrumented (already instrumented functions are kept as they are).
+    """
+    return {
+        name: func if getattr(func, "__instrumented__", False) else instrumented_tool(name, metrics)(func)
+        for name, func in tool_map.items()
+    }
+
+
+def instrument_tools(tools: list, metrics: ToolMetrics = None) -> list:
+    """
+    Instruments an aisuite-style list of tool functions, e.g.
+    `client.chat.completions.create(..., tools=instrument_tools([...]))`.
+    """
+    return [_instrument(func, metrics) for func in tools]
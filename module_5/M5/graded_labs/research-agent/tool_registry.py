@@ -0,0 +1,198 @@
+# --- Standard library ---
+import copy
+import functools
+import inspect
+import json
+import threading
+import typing
+
+# --- Third-party ---
+from docstring_parser import parse
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean", list: "array", dict: "object"}
+
+
+def _json_type(annotation) -> str:
+    origin = typing.get_origin(annotation) or annotation
+    return _JSON_TYPES.get(origin, "string")
+
+
+def function_schema(func, name: str = None, description: str = None) -> dict:
+    """
+    Builds an OpenAI-style tool definition from a function's signature and
+    Google-style docstring (summary line(s) and `Args:` descriptions).
+
+    Args:
+        func (callable): Tool function; every parameter needs a type annotation.
+        name (str): Tool name; defaults to the function name.
+        description (str): Overrides the docstring summary.
+
+    Returns:
+        dict: {"type": "function", "function": {"name", "description", "parameters"}}.
+    """
+    docstring = parse(inspect.getdoc(func) or "")
+    arg_docs = {param.arg_name: param.description or "" for param in docstring.params}
+    if description is None:
+        description = docstring.short_description or ""
+        if docstring.long_description:
+            description += "\n\n" + docstring.long_description
+
+    properties = {}
+    required = []
+    for param_name, param in inspect.signature(func).parameters.items():
+        if param.annotation is inspect.Parameter.empty:
+            raise TypeError(f"Parameter '{param_name}' of tool '{func.__name__}' needs a type annotation.")
+        prop = {"type": _json_type(param.annotation)}
+        if arg_docs.get(param_name):
+            prop["description"] = arg_docs[param_name]
+        if param.default is inspect.Parameter.empty:
+            required.append(param_name)
+        else:
+            prop["default"] = param.default
+        properties[param_name] = prop
+
+    parameters = {"type": "object", "properties": properties}
+    if required:
+        parameters["required"] = required
+    return {
+        "type": "function",
+        "function": {"name": name or func.__name__, "description": description, "parameters": parameters},
+    }
+
+
+@functools.cache
+def _concurrent_tools_class():
+    """
+    aisuite `Tools` subclass whose `execute_tool` runs all tool calls of a
+    turn concurrently through `tool_executor.execute_tool_calls`, instead of
+    one after another, and trims each result to `budget` (a
+    `token_budget.ToolResultBudget`, if set) before it enters the
+    conversation. Built on first use since aisuite is only needed then.
+    """
+    from aisuite.utils.tools import Tools
+    from tool_executor import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT, build_tool_messages, execute_tool_calls
+
+    class ConcurrentTools(Tools):
+        max_workers = DEFAULT_MAX_WORKERS
+        timeout = DEFAULT_TIMEOUT
+        budget = None
+
+        def _validated(self, name: str):
+            """The tool function behind aisuite's argument validation, as `Tools.execute_tool` does it."""
+            tool = self._tools[name]
+
+            def call(**arguments):
+                return tool["function"](**tool["param_model"](**arguments).model_dump())
+
+            return call
+
+        def execute_tool(self, tool_calls) -> tuple[list, list]:
+            if not isinstance(tool_calls, list):
+                tool_calls = [tool_calls]
+            tool_map = {name: self._validated(name) for name in self._tools}
+            results = execute_tool_calls(tool_calls, tool_map, max_workers=self.max_workers, timeout=self.timeout)
+            return results, build_tool_messages(tool_calls, results, budget=self.budget)
+
+    return ConcurrentTools
+
+
+class ToolRegistry:
+    """
+    Tool functions plus their JSON schemas, generated once and reused.
+
+    Schemas, the serialized payload and the aisuite `Tools` object are built
+    on first use and cached until another tool is registered, so agent loops
+    pass the same prebuilt structures to every request instead of
+    re-introspecting the functions each turn. Treat returned definitions as
+    read-only.
+
+    Args:
+        tools (list): Tool functions to register up front.
+    """
+
+    def __init__(self, tools: list = None):
+        self._functions = {}
+        self._overrides = {}
+        self._definitions = None
+        self._payload = None
+        self._aisuite_tools = None
+        self._lock = threading.Lock()
+        for func in tools or []:
+            self.register(func)
+
+    def register(self, func=None, *, name: str = None, description: str = None):
+        """
+        Adds a tool. Usable directly or as a decorator (`@registry.register`).
+        """
+        def add(f):
+            tool_name = name or f.__name__
+            with self._lock:
+                self._functions[tool_name] = f
+                self._overrides[tool_name] = description
+                self._definitions = self._payload = self._aisuite_tools = None
+            return f
+
+        return add(func) if func is not None else add
+
+    @property
+    def mapping(self) -> dict:
+        """Tool name -> function, for dispatching tool calls."""
+        return dict(self._functions)
+
+    def definitions(self) -> list[dict]:
+        """OpenAI-style tool definitions (cached)."""
+        with self._lock:
+            if self._definitions is None:
+                self._definitions = [
+                    function_schema(func, name, self._overrides[name])
+                    for name, func in self._functions.items()
+                ]
+            return self._definitions
+
+    def definition(self, name: str) -> dict:
+        """Definition of one registered tool."""
+        for tool_def in self.definitions():
+            if tool_def["function"]["name"] == name:
+                return tool_def
+        raise KeyError(name)
+
+    def payload(self) -> str:
+        """The definitions serialized as JSON (cached), for raw HTTP clients."""
+        definitions = self.definitions()
+        with self._lock:
+            if self._payload is None:
+                self._payload = json.dumps(definitions, separators=(",", ":"))
+            return self._payload
+
+    def aisuite_tools(self, budget=None):
+        """
+        Prebuilt `aisuite.utils.tools.Tools` for `client.chat.completions.create(
+        ..., tools=registry.aisuite_tools(), max_turns=...)`. aisuite builds a
+        new one from a list of functions on every call; this one is built once,
+        and it runs the tool calls of each turn concurrently.
+
+        Args:
+            budget (token_budget.ToolResultBudget): Trims every tool result to
+                this budget. A budget counts a whole conversation, so pass a
+                new one per conversation; the schemas are shared either way.
+        """
+        with self._lock:
+            if self._aisuite_tools is None:
+                self._aisuite_tools = _concurrent_tools_class()(list(self._functions.values()))
+            tools = self._aisuite_tools
+        if budget is None:
+            return tools
+        tools = copy.copy(tools)
+        tools.budget = budget
+        return tools
+
+    def call(self, name: str, arguments):
+        """
+        Runs a registered tool with a dict or JSON string of arguments.
+
+        Raises:
+            KeyError: No tool with that name is registered.
+        """
+        if isinstance(arguments, str):
+            arguments = json.loads(arguments) if arguments else {}
+        return self._functions[name](**(arguments or {}))
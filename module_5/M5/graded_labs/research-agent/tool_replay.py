@@ -0,0 +1,217 @@
+"""
+Record/replay of research tool responses, for offline and deterministic runs.
+
+Record once with network access, then replay from disk:
+
+    RESEARCH_TOOLS_REPLAY=record jupyter nbconvert --execute GL-M5.ipynb   # live calls, saved
+    RESEARCH_TOOLS_REPLAY=replay jupyter nbconvert --execute GL-M5.ipynb   # no network at all
+
+Besides the decorated search tools, batched arXiv id lookups
+(`research_tools.arxiv_papers_by_ids`) and extracted PDF text
+(`arxiv_pdf.fetch_paper_texts`) are recorded and replayed too.
+
+Modes (RESEARCH_TOOLS_REPLAY):
+    off     live calls, nothing recorded (default)
+    record  live calls; successful responses are added to the fixture store
+    replay  responses come only from the store; a missing fixture returns
+            the usual `[{"error": ...}]` shape instead of calling out
+    auto    replay when a fixture exists, otherwise call live and record
+
+Fixtures are keyed by the normalized request (same key as the response
+cache) and stored as gzip-compressed JSON lines in RESEARCH_TOOLS_FIXTURES
+(default "research_tools_fixtures.jsonl.gz").
+"""
+
+# --- Standard library ---
+import functools
+import gzip
+import inspect
+import json
+import os
+import threading
+
+# --- Local / project ---
+from tool_cache import is_error_result, make_cache_key, normalize_query, request_key
+
+DEFAULT_FIXTURES_PATH = "research_tools_fixtures.jsonl.gz"
+MODES = ("off", "record", "replay", "auto")
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class FixtureStore:
+    """
+    Append-only JSON-lines store of recorded tool responses.
+
+    Each line is {"key", "tool", "query", "result"}; later lines win, so
+    re-recording a request simply appends. `compact()` rewrites the file
+    with one line per key.
+
+    Args:
+        path (str): Fixture file; a ".gz" suffix enables gzip compression.
+    """
+
+    def __init__(self, path: str = DEFAULT_FIXTURES_PATH):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            entries = {}
+            if os.path.exists(self.path):
+                with _open(self.path, "r") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            entries[entry["key"]] = entry
+            self._entries = entries
+        return self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def get(self, key: str):
+        """Recorded result for `key`, or None."""
+        with self._lock:
+            entry = self._load().get(key)
+        return entry["result"] if entry is not None else None
+
+    def put(self, key: str, tool_name: str, query: str, result) -> None:
+        """Records `result` unless an identical one is already stored."""
+        with self._lock:
+            entries = self._load()
+            if key in entries and entries[key]["result"] == result:
+                return
+            entry = {"key": key, "tool": tool_name, "query": normalize_query(query), "result": result}
+            entries[key] = entry
+            with _open(self.path, "a") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def compact(self) -> int:
+        """Rewrites the file with one line per key (sorted); returns the count."""
+        with self._lock:
+            entries = self._load()
+            tmp_path = self.path + ".tmp"
+            with _open(tmp_path, "w") as f:
+                for key in sorted(entries):
+                    f.write(json.dumps(entries[key], separators=(",", ":")) + "\n")
+            os.replace(tmp_path, self.path)
+            return len(entries)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def replay_mode() -> str:
+    """Current mode from RESEARCH_TOOLS_REPLAY (read on every call)."""
+    mode = os.getenv("RESEARCH_TOOLS_REPLAY", "off").lower()
+    if mode not in MODES:
+        raise ValueError(f"RESEARCH_TOOLS_REPLAY must be one of {MODES}, got {mode!r}")
+    return mode
+
+
+def get_fixture_store() -> FixtureStore:
+    """Shared store at RESEARCH_TOOLS_FIXTURES, opened on first use."""
+    global _default_store
+    path = os.getenv("RESEARCH_TOOLS_FIXTURES", DEFAULT_FIXTURES_PATH)
+    with _default_store_lock:
+        if _default_store is None or _default_store.path != path:
+            _default_store = FixtureStore(path)
+        return _default_store
+
+
+def set_fixture_store(store: FixtureStore) -> None:
+    """Replaces the shared store (e.g. to point tests at a temporary file)."""
+    global _default_store
+    with _default_store_lock:
+        _default_store = store
+
+
+def lookup_fixture(tool_name: str, query: str, **params) -> tuple:
+    """
+    Replay lookup for code paths that are not a single decorated tool call
+    (e.g. PDF text extraction). Pass the result and the returned mode and key
+    to `record_fixture` once it has been computed live.
+
+    Returns:
+        tuple: (mode, key, recorded result or None). In "replay" mode a None
+        result means the fixture is missing and nothing may be fetched.
+    """
+    mode = replay_mode()
+    if mode == "off":
+        return mode, None, None
+    key = make_cache_key(tool_name, query, **params)
+    recorded = get_fixture_store().get(key) if mode in ("replay", "auto") else None
+    return mode, key, recorded
+
+
+def record_fixture(mode: str, key: str, tool_name: str, query: str, result) -> None:
+    """Stores a live result looked up with `lookup_fixture`, if the mode records."""
+    if mode in ("record", "auto") and not is_error_result(result):
+        get_fixture_store().put(key, tool_name, query, result)
+
+
+def replayable_tool(tool_name: str):
+    """
+    Decorator that records or replays a search tool's responses according
+    to `replay_mode()`. Like `cached_tool`, the wrapped function must take
+    the search string as `query`; error results are never recorded.
+
+    Args:
+        tool_name (str): Name used in the fixture key.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def before(args, kwargs):
+            """Returns (mode, store, key, recorded result or None)."""
+            mode = replay_mode()
+            if mode == "off":
+                return mode, None, None, None
+            store = get_fixture_store()
+            key = request_key(tool_name, signature, args, kwargs)
+            recorded = store.get(key) if mode in ("replay", "auto") else None
+            return mode, store, key, recorded
+
+        def missing(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            return [{"error": f"No recorded fixture for {tool_name}({bound.arguments.get('query')!r}) in replay mode"}]
+
+        def after(mode, store, key, args, kwargs, result):
+            if mode in ("record", "auto") and not is_error_result(result):
+                query = signature.bind(*args, **kwargs).arguments.get("query", "")
+                store.put(key, tool_name, query, result)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                mode, store, key, recorded = before(args, kwargs)
+                if recorded is not None:
+                    return recorded
+                if mode == "replay":
+                    return missing(args, kwargs)
+                result = await func(*args, **kwargs)
+                after(mode, store, key, args, kwargs, result)
+                return result
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                mode, store, key, recorded = before(args, kwargs)
+                if recorded is not None:
+                    return recorded
+                if mode == "replay":
+                    return missing(args, kwargs)
+                result = func(*args, **kwargs)
+                after(mode, store, key, args, kwargs, result)
+                return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,67 @@
+# --- Standard library ---
+import inspect
+import json
+import typing
+
+# --- Third-party ---
+from docstring_parser import parse
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean", list: "array", dict: "object"}
+
+
+def _json_type(annotation) -> str:
+    origin = typing.get_origin(annotation) or annotation
+    return _JSON_TYPES.get(origin, "string")
+
+
+def function_schema(func) -> dict:
+    """
+    OpenAI-style tool definition of `func`: its name, docstring summary,
+    annotated parameters (with defaults) and `Args:` descriptions.
+    """
+    docstring = parse(inspect.getdoc(func) or "")
+    arg_docs = {param.arg_name: param.description for param in docstring.params}
+
+    properties = {}
+    required = []
+    for param_name, param in inspect.signature(func).parameters.items():
+        prop = {"type": _json_type(param.annotation)}
+        if arg_docs.get(param_name):
+            prop["description"] = arg_docs[param_name]
+        if param.default is inspect.Parameter.empty:
+            required.append(param_name)
+        else:
+            prop["default"] = param.default
+        properties[param_name] = prop
+
+    parameters = {"type": "object", "properties": properties}
+    if required:
+        parameters["required"] = required
+    return {
+        "type": "function",
+        "function": {"name": func.__name__, "description": docstring.short_description or "", "parameters": parameters},
+    }
+
+
+class ToolRegistry:
+    """
+    The lab's tool functions and their definitions, built on first use so
+    every chat request reuses the same list.
+
+    Args:
+        tools (list): Tool functions.
+    """
+
+    def __init__(self, tools: list):
+        self._functions = {func.__name__: func for func in tools}
+        self._definitions = None
+
+    def definitions(self) -> list[dict]:
+        """Tool definitions for the `tools=` argument (shared; do not modify)."""
+        if self._definitions is None:
+            self._definitions = [function_schema(func) for func in self._functions.values()]
+        return self._definitions
+
+    def call(self, name: str, arguments: str):
+        """Runs the tool `name` with the JSON-encoded arguments of a tool call."""
+        return self._functions[name](**json.loads(arguments or "{}"))
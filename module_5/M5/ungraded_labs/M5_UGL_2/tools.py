@@ -1,11 +1,13 @@
 import requests
 import os
 import json
+import threading
 from dotenv import load_dotenv
 from tavily import TavilyClient
 import pandas as pd
 
 from inventory_utils import create_inventory_dataframe
+from tool_registry import ToolRegistry
 
 # Session setup (optional)
 session = requests.Session()
@@ -15,23 +17,37 @@ session.headers.update({
 
 load_dotenv()
 
-# 🔧 TOOL IMPLEMENTATIONS
+# Shared Tavily client, reused across calls (keep-alive connections) and
+# rebuilt only when the API key or base URL in the environment change.
+_tavily_client = None
+_tavily_client_settings = None
+_tavily_client_lock = threading.Lock()
 
-def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict[str, str]]:
-    
-    params = {}
+
+def get_tavily_client() -> TavilyClient:
+    global _tavily_client, _tavily_client_settings
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
         raise ValueError("TAVILY_API_KEY not found in environment variables.")
-    params['api_key'] = api_key
+    settings = (api_key, os.getenv("DLAI_TAVILY_BASE_URL"))
 
-    #client = TavilyClient(api_key)
+    with _tavily_client_lock:
+        if _tavily_client is None or settings != _tavily_client_settings:
+            _tavily_client = TavilyClient(api_key=settings[0], api_base_url=settings[1])
+            _tavily_client_settings = settings
+        return _tavily_client
 
-    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
-    if api_base_url:
-        params['api_base_url'] = api_base_url
 
-    client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
+# 🔧 TOOL IMPLEMENTATIONS
+
+def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict[str, str]]:
+    """
+    Perform web search for sunglasses trends using Tavily.
+
+    Args:
+        query (str): Search query
+    """
+    client = get_tavily_client()
 
     try:
         response = client.search(
@@ -59,58 +75,26 @@ def tavily_search_tool(query: str, max_results: int = 5, include_images: bool =
     
 
 def product_catalog_tool(max_items: int = 10) -> list[dict[str, str]]:
+    """Get sunglasses products from internal inventory."""
     inventory_df = create_inventory_dataframe()
     return inventory_df.head(max_items).to_dict(orient="records")
 
 
 # 🧠 TOOL METADATA FOR LLM
 
+# Schemas are generated once from the functions' signatures and docstrings;
+# only documented parameters get a description, as in the former hand-written defs
+tool_registry = ToolRegistry([tavily_search_tool, product_catalog_tool])
+
+
 def get_available_tools():
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "tavily_search_tool",
-                "description": "Perform web search for sunglasses trends using Tavily.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "description": "Search query"},
-                        "max_results": {"type": "integer", "default": 5},
-                        "include_images": {"type": "boolean", "default": False}
-                    },
-                    "required": ["query"]
-                }
-            }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "product_catalog_tool",
-                "description": "Get sunglasses products from internal inventory.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "max_items": {"type": "integer", "default": 10}
-                    }
-                }
-            }
-        }
-    ]
+    return tool_registry.definitions()
 
 
 # 🔁 TOOL CALL DISPATCHER
 
 def handle_tool_call(tool_call):
-    function_name = tool_call.function.name
-    arguments = json.loads(tool_call.function.arguments)
-
-    tools_map = {
-        "tavily_search_tool": tavily_search_tool,
-        "product_catalog_tool": product_catalog_tool,
-    }
-
-    return tools_map[function_name](**arguments)
+    return tool_registry.call(tool_call.function.name, tool_call.function.arguments)
 
 
 def create_tool_response_message(tool_call, tool_result):